@@ -0,0 +1,94 @@
+import re
+from urllib.parse import urlparse
+
+NUMERIC_SEGMENT = re.compile(r'^\d+$')
+UUID_SEGMENT = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+HASH_SEGMENT = re.compile(r'^[0-9a-fA-F]{16,}$')
+API_MARKER_SEGMENT = re.compile(r'^(?:api|apis|rest|service|services|graphql|v\d+(?:\.\d+)?)$', re.IGNORECASE)
+
+
+def template_segment(segment):
+    """숫자/UUID/해시 형태의 경로 조각을 템플릿({id}, {uuid}, {hash})으로 바꿉니다."""
+    if NUMERIC_SEGMENT.match(segment):
+        return '{id}'
+    if UUID_SEGMENT.match(segment):
+        return '{uuid}'
+    if HASH_SEGMENT.match(segment):
+        return '{hash}'
+    return segment
+
+
+def is_template(segment):
+    return segment.startswith('{') and segment.endswith('}')
+
+
+class _Node:
+    __slots__ = ('children', 'endpoint_count')
+
+    def __init__(self):
+        self.children = {}
+        self.endpoint_count = 0
+
+
+class ApiPrefixTree:
+    """JS 에서 발견된 엔드포인트를 경로 조각 단위 prefix tree 로 합칩니다.
+
+    숫자/UUID 조각은 템플릿으로 합쳐지므로 /api/v1/users/123 과 /api/v1/users/456 은 같은 템플릿이 되고,
+    딕셔너리 확장은 추론된 API 베이스(/api/v1/ 등)에만 적용됩니다.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        self.templates = {}
+
+    @staticmethod
+    def split_template(url):
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        segments = tuple(template_segment(segment) for segment in parsed.path.split('/') if segment)
+        return origin, segments
+
+    def add(self, url):
+        """엔드포인트를 추가합니다. 처음 보는 템플릿이면 True 를 반환합니다."""
+        origin, segments = self.split_template(url)
+        key = (origin, segments)
+        if key in self.templates:
+            return False
+        self.templates[key] = url
+        node = self.root.children.setdefault(origin, _Node())
+        for segment in segments:
+            node = node.children.setdefault(segment, _Node())
+            node.endpoint_count += 1
+        return True
+
+    def infer_base(self, url):
+        """엔드포인트의 API 베이스 URL 을 추론합니다.
+
+        마지막 API 표지 조각(api, rest, v1 ...)까지를 베이스로 보고, 표지가 없으면 처음으로 분기하는 노드,
+        그것도 없으면 상위 디렉토리를 베이스로 사용합니다. 템플릿 조각 이후로는 베이스가 내려가지 않습니다.
+        """
+        origin, segments = self.split_template(url)
+        concrete = []
+        for segment in segments:
+            if is_template(segment):
+                break
+            concrete.append(segment)
+
+        marker_index = None
+        for index, segment in enumerate(concrete):
+            if API_MARKER_SEGMENT.match(segment):
+                marker_index = index
+        if marker_index is not None:
+            base_segments = concrete[:marker_index + 1]
+        else:
+            base_segments = concrete[:max(len(concrete) - 1, 0)] if len(concrete) == len(segments) else concrete
+            node = self.root.children.get(origin)
+            for index, segment in enumerate(base_segments):
+                node = node.children.get(segment) if node is not None else None
+                if node is not None and len(node.children) > 1:
+                    base_segments = base_segments[:index + 1]
+                    break
+
+        if not base_segments:
+            return None
+        return f"{origin}/{'/'.join(base_segments)}/"
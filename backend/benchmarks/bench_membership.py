@@ -0,0 +1,70 @@
+"""방문 집합 구현별 메모리(RSS) 비교 벤치마크.
+
+각 구현을 별도 프로세스에서 실행하여 URL 을 N 개 추가한 뒤 최대 RSS 증가량과 오탐률을 출력합니다.
+
+    python benchmarks/bench_membership.py --urls 1000000
+"""
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from membership import make_membership
+
+
+def _max_rss_kib():
+    # Linux 의 ru_maxrss 단위는 KiB 입니다 (macOS 는 bytes).
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def _url(index):
+    return f"https://www.example.com/section-{index % 997}/page/{index}?ref=crawl&session=abcdef{index:08d}"
+
+
+def run_single(kind, url_count, error_rate, spill):
+    spill_dir = tempfile.mkdtemp(prefix='membership-bench-') if spill else None
+    try:
+        baseline = _max_rss_kib()
+        started = time.perf_counter()
+        members = make_membership(kind, error_rate=error_rate, spill_dir=spill_dir)
+        for index in range(url_count):
+            members.add(_url(index))
+        elapsed = time.perf_counter() - started
+
+        probes = min(url_count, 100000)
+        false_positives = sum(1 for index in range(url_count, url_count + probes) if _url(index) in members)
+        if hasattr(members, 'close'):
+            members.close()
+    finally:
+        if spill_dir is not None:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+    label = f"{kind}{'+spill' if spill else ''}"
+    print(f"{label:<12} urls={url_count:<9} rss_delta={(_max_rss_kib() - baseline) / 1024:8.1f} MiB "
+          f"insert={elapsed:6.2f}s false_positive_rate={false_positives / probes:.5f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--urls', type=int, default=1000000)
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    parser.add_argument('--single', choices=['exact', 'bloom', 'bloom+spill'])
+    args = parser.parse_args()
+
+    if args.single:
+        kind, _, spill = args.single.partition('+')
+        run_single(kind, args.urls, args.error_rate, bool(spill))
+        return
+
+    for variant in ('exact', 'bloom', 'bloom+spill'):
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--single', variant,
+                        '--urls', str(args.urls), '--error-rate', str(args.error_rate)], check=True)
+
+
+if __name__ == '__main__':
+    main()
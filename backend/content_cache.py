@@ -0,0 +1,51 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_digest(content):
+    """응답 본문의 해시(blake2b-128, hex)를 반환합니다. bytes 가 아니면 None."""
+    if not isinstance(content, (bytes, bytearray)) or not content:
+        return None
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class ContentDigestCache:
+    """본문 해시 -> 분석 결과를 보관하는 스레드 안전 LRU 캐시. 스캔 간에도 재사용됩니다."""
+
+    def __init__(self, max_entries=2048, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        if digest is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return value
+
+    def put(self, digest, value):
+        if digest is None:
+            return
+        with self._lock:
+            self._entries[digest] = (time.monotonic(), value)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+JS_PATH_CACHE = ContentDigestCache()
@@ -0,0 +1,161 @@
+import re
+
+# 기술별 탐지 신호. 각 신호는 (위치, 패턴, 가중치) 이며 위치는 header/cookie/html 중 하나입니다.
+TECHNOLOGY_SIGNATURES = {
+    'php': [
+        ('header', r'php', 3),
+        ('cookie', r'^phpsessid$', 3),
+        ('html', r'\.php\b', 1),
+        ('html', r'/wp-(?:content|includes)/', 2),
+    ],
+    'aspnet': [
+        ('header', r'asp\.net', 3),
+        ('cookie', r'^asp\.net_sessionid$', 3),
+        ('cookie', r'^\.aspxauth$', 3),
+        ('html', r'__VIEWSTATE|\.aspx\b', 2),
+    ],
+    'java': [
+        ('header', r'servlet|jsp|tomcat|jetty|wildfly|jboss', 3),
+        ('cookie', r'^jsessionid$', 3),
+        ('html', r'\.(?:jsp|do|action)\b', 2),
+    ],
+    'django': [
+        ('header', r'django|wsgiserver', 2),
+        ('cookie', r'^(?:csrftoken|sessionid)$', 2),
+        ('html', r'csrfmiddlewaretoken', 3),
+    ],
+    'rails': [
+        ('header', r'ruby|rails|phusion|passenger', 3),
+        ('cookie', r'^_[a-z0-9_]+_session$', 2),
+        ('html', r'csrf-param|data-turbo|authenticity_token', 2),
+    ],
+    'node': [
+        ('header', r'express|next\.js|nuxt', 3),
+        ('cookie', r'^connect\.sid$', 3),
+        ('html', r'__NEXT_DATA__|__NUXT__|/_next/|webpackJsonp|ng-version', 2),
+    ],
+}
+
+# Framework_Hint 문자열과 기술 키의 대응 관계.
+FRAMEWORK_HINT_TECHNOLOGIES = {
+    'ASP.NET': 'aspnet',
+    'PHP': 'php',
+    'PHP (Session)': 'php',
+    'Express.js (Node.js)': 'node',
+    'Django (Python)': 'django',
+    'Ruby on Rails': 'rails',
+    'Java (JSP/Servlets)': 'java',
+}
+
+# 기술별 추가 워드리스트 팩. 추가 요청 수를 줄이기 위해 기술별로 가치가 높은 경로만 유지합니다.
+TECHNOLOGY_WORDLISTS = {
+    'php': [
+        "phpinfo.php", "wp-admin/", "wp-config.php.bak", "phpmyadmin/", "composer.json"
+    ],
+    'aspnet': [
+        "web.config", "trace.axd", "elmah.axd", "App_Data/", "bin/", "aspnet_client/",
+        "Default.aspx", "Web.config.bak"
+    ],
+    'java': [
+        "WEB-INF/web.xml", "META-INF/MANIFEST.MF", "manager/html", "actuator/", "actuator/env",
+        "jmx-console/"
+    ],
+    'django': [
+        "admin/login/", "static/admin/", "media/", "__debug__/", "api/schema/", "settings.py"
+    ],
+    'rails': [
+        "rails/info/properties", "rails/info/routes", "assets/", "packs/", "config/database.yml",
+        "sidekiq/", "cable"
+    ],
+    'node': [
+        "package.json", ".next/", ".npmrc", "api/graphql"
+    ],
+}
+
+# 기본 사전(main.DEFAULT_DICTIONARY) 중 특정 기술에서만 의미가 있는 경로. 기술이 탐지되었는데
+# 해당 기술이 하나도 없으면 사전에서 제외합니다. 태그가 없는 경로와 사용자가 추가한 경로는 항상 유지됩니다.
+DEFAULT_PATH_TECHNOLOGIES = {
+    "node_modules/": ('node',),
+    "vendor/": ('php', 'rails'),
+    ".htaccess/": ('php',),
+    ".htpasswd/": ('php',),
+}
+
+MIN_TECHNOLOGY_SCORE = 3
+
+
+def fingerprint_response(response, framework_hint=None):
+    """응답의 헤더, 쿠키, HTML/JS 본문 신호와 Framework_Hint 를 합산하여 {기술: 점수} 를 반환합니다."""
+    scores = score_signals(match_signals(response)) if response is not None else {}
+
+    hinted = FRAMEWORK_HINT_TECHNOLOGIES.get(framework_hint)
+    if hinted:
+        scores[hinted] = scores.get(hinted, 0) + MIN_TECHNOLOGY_SCORE
+    return scores
+
+
+def score_signals(signals):
+    """일치한 신호 집합을 {기술: 점수} 로 합산합니다. 같은 신호는 한 번만 더해집니다."""
+    scores = {}
+    for technology, index in signals:
+        scores[technology] = scores.get(technology, 0) + TECHNOLOGY_SIGNATURES[technology][index][2]
+    return scores
+
+
+def match_signals(response):
+    """응답에서 일치한 신호를 (기술, 신호 번호) 집합으로 반환합니다."""
+    headers = response.headers or {}
+    header_text = ' '.join(
+        str(headers.get(name, '')) for name in ('Server', 'X-Powered-By', 'X-AspNet-Version', 'X-Generator')
+    ).lower()
+    cookie_names = [cookie.name.lower() for cookie in (response.cookies or [])]
+    content_type = str(headers.get('Content-Type', '')).lower()
+    body = response.text if ('html' in content_type or 'javascript' in content_type) else ''
+    if not isinstance(body, str):
+        body = ''
+
+    matched_signals = set()
+    for technology, signals in TECHNOLOGY_SIGNATURES.items():
+        for index, (location, pattern, _) in enumerate(signals):
+            if location == 'header':
+                matched = bool(re.search(pattern, header_text))
+            elif location == 'cookie':
+                matched = any(re.search(pattern, name) for name in cookie_names)
+            else:
+                matched = bool(body) and re.search(pattern, body) is not None
+            if matched:
+                matched_signals.add((technology, index))
+    return matched_signals
+
+
+def detected_technologies(scores, min_score=MIN_TECHNOLOGY_SCORE):
+    """점수가 min_score 이상인 기술을 점수 내림차순으로 반환합니다."""
+    return [tech for tech, score in sorted(scores.items(), key=lambda item: -item[1]) if score >= min_score]
+
+
+def select_dictionary(base_dictionary, technologies, keep_paths=()):
+    """탐지된 기술에 맞춰 사전을 재구성합니다.
+
+    DEFAULT_PATH_TECHNOLOGIES 에서 탐지된 기술과 관계없는 기본 경로는 제외하고, 탐지된 기술의 워드리스트 팩을
+    점수 순으로 앞에 배치합니다. keep_paths(사용자가 추가한 경로)는 제외하지 않습니다.
+    탐지된 기술이 없으면 원래 사전을 그대로 반환합니다.
+    """
+    if not technologies:
+        return list(base_dictionary)
+
+    selected = []
+    seen = set()
+    for tech in technologies:
+        for path in TECHNOLOGY_WORDLISTS.get(tech, []):
+            if path not in seen:
+                seen.add(path)
+                selected.append(path)
+    for path in base_dictionary:
+        if path in seen:
+            continue
+        path_technologies = DEFAULT_PATH_TECHNOLOGIES.get(path)
+        if path_technologies and path not in keep_paths and not any(tech in technologies for tech in path_technologies):
+            continue
+        seen.add(path)
+        selected.append(path)
+    return selected
@@ -0,0 +1,78 @@
+import math
+import threading
+from collections import deque
+
+DEFAULT_WINDOW = 500
+MIN_SAMPLES = 20
+TIMEOUT_PERCENTILE = 99
+TIMEOUT_FACTOR = 3.0
+MIN_TIMEOUT = 2.0
+HEDGE_PERCENTILE = 95
+MIN_HEDGE_DELAY = 0.05
+
+
+def percentile(sorted_values, percent):
+    """정렬된 값 목록의 nearest-rank 백분위수."""
+    if not sorted_values:
+        return None
+    rank = max(1, int(math.ceil(percent / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class HostLatencyTracker:
+    """호스트별 최근 응답 시간을 기록하여 적응형 타임아웃과 hedge 지연 시간을 계산합니다.
+
+    표본이 MIN_SAMPLES 개 미만이면 기본 타임아웃을 그대로 사용하고, 이후에는
+    p99 x factor 를 [min_timeout, 기본 타임아웃] 범위로 제한한 값을 사용합니다.
+    타임아웃된 요청은 타임아웃 값으로 기록되므로, 호스트가 실제로 느려지면 타임아웃도 다시 늘어납니다.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, min_samples=MIN_SAMPLES, factor=TIMEOUT_FACTOR, min_timeout=MIN_TIMEOUT):
+        self.window = window
+        self.min_samples = min_samples
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, host, seconds):
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def _sorted_samples(self, host):
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            return sorted(samples)
+
+    def timeout_for(self, host, default_timeout):
+        samples = self._sorted_samples(host)
+        if samples is None:
+            return default_timeout
+        adaptive = percentile(samples, TIMEOUT_PERCENTILE) * self.factor
+        return min(default_timeout, max(self.min_timeout, adaptive))
+
+    def hedge_delay(self, host):
+        """hedge 요청을 보내기 전 기다릴 시간(p95). 표본이 부족하면 None."""
+        samples = self._sorted_samples(host)
+        if samples is None:
+            return None
+        return max(MIN_HEDGE_DELAY, percentile(samples, HEDGE_PERCENTILE))
+
+    def summary(self):
+        """호스트별 표본 수와 p50/p95/p99 (초)."""
+        with self._lock:
+            snapshot = {host: sorted(samples) for host, samples in self._samples.items()}
+        return {
+            host: {
+                'samples': len(samples),
+                'p50': round(percentile(samples, 50), 4),
+                'p95': round(percentile(samples, 95), 4),
+                'p99': round(percentile(samples, 99), 4),
+            }
+            for host, samples in snapshot.items() if samples
+        }
@@ -1,12 +1,32 @@
+import os
+import re
 import sys
+import time
 import traceback
-from fastapi import FastAPI, HTTPException
+import uuid
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from scanner import MultiWebScanner
+from scanner_context import ScannerContext
+from profiling import SamplingProfiler
+from traffic_archive import TrafficArchive, TRAFFIC_MODES
+from membership import MEMBERSHIP_KINDS
+from results import (RESPONSE_FORMATS, RESULT_POLICIES, SORTABLE_FIELDS, MSGPACK_AVAILABLE, as_result_table,
+                     iter_scan_response_json, build_columnar_response, encode_msgpack_response)
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
 
-app = FastAPI()
+SCANNER_CONTEXT = ScannerContext()
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    SCANNER_CONTEXT.close()
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -32,6 +52,51 @@ DEFAULT_DICTIONARY = [
     ".well-known/jwks.json"
 ]
 
+TRAFFIC_ARCHIVE_DIR = os.environ.get("TRAFFIC_ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "traffic_archives"))
+# 아카이브 '<name>' 의 색인은 '<name>.idx' 에 저장되므로 '.idx' 로 끝나는 이름은 다른 아카이브의 색인을 덮어쓰게 됩니다.
+TRAFFIC_ARCHIVE_NAME_PATTERN = re.compile(r"^(?!.*\.idx$)[A-Za-z0-9_.-]+$", re.IGNORECASE)
+
+# 조회 API 용 결과 보관 한도. 스캔 수, 전체 레코드 수, 보관 시간 중 하나라도 넘으면 오래된 결과부터 제거합니다.
+MAX_STORED_SCANS = 20
+MAX_STORED_RECORDS = int(os.environ.get("MAX_STORED_RECORDS", "200000"))
+STORED_SCAN_TTL = int(os.environ.get("STORED_SCAN_TTL", "3600"))
+# scan_id -> (저장 시각, 레코드 수, {target_url: {"directories": ResultTable}})
+SCAN_RESULTS_STORE = OrderedDict()
+
+def _evict_stored_scans():
+    now = time.monotonic()
+    total_records = sum(record_count for _, record_count, _ in SCAN_RESULTS_STORE.values())
+    while SCAN_RESULTS_STORE:
+        stored_at, record_count, _ = next(iter(SCAN_RESULTS_STORE.values()))
+        if (len(SCAN_RESULTS_STORE) <= MAX_STORED_SCANS and total_records <= MAX_STORED_RECORDS
+                and now - stored_at <= STORED_SCAN_TTL):
+            break
+        SCAN_RESULTS_STORE.popitem(last=False)
+        total_records -= record_count
+
+def store_scan_results(results_by_target):
+    """스캔 결과를 조회 API 용으로 보관하고 scan_id 를 반환합니다.
+
+    조회 API 는 directories 만 사용하므로 프로파일 등 나머지 키는 보관하지 않습니다.
+    결과 하나가 MAX_STORED_RECORDS 를 넘으면 보관하지 않고 None 을 반환합니다.
+    """
+    stored = {target_url: {"directories": as_result_table(result.get("directories"))}
+              for target_url, result in results_by_target.items()}
+    record_count = sum(len(target_result["directories"]) for target_result in stored.values())
+    if record_count > MAX_STORED_RECORDS:
+        print(f"[*] 결과 레코드 {record_count}개가 보관 한도({MAX_STORED_RECORDS})를 넘어 조회 API 용으로 보관하지 않습니다.")
+        return None
+    scan_id = uuid.uuid4().hex
+    SCAN_RESULTS_STORE[scan_id] = (time.monotonic(), record_count, stored)
+    _evict_stored_scans()
+    return scan_id
+
+def get_stored_scan_results(scan_id):
+    """보관 중인 스캔 결과를 반환합니다. 없거나 보관 시간이 지났으면 None."""
+    _evict_stored_scans()
+    entry = SCAN_RESULTS_STORE.get(scan_id)
+    return entry[2] if entry is not None else None
+
 class DictionaryOperation(BaseModel):
     type: str
     paths: List[str]
@@ -45,12 +110,50 @@ class ScanRequest(BaseModel):
     max_depth: int = 2
     respect_robots_txt: bool = True
     session_cookies_string: Optional[str] = None
+    response_format: str = 'json'
+    result_policy: str = 'all'
+    use_sitemaps: bool = True
+    max_sitemap_urls: int = 500
+    tech_aware_dictionary: bool = True
+    mutation_budget: int = 200
+    http2: bool = False
+    probe_concurrency: Optional[int] = None
+    profile: bool = False
+    membership: str = 'exact'
+    membership_error_rate: float = 0.001
+    traffic_mode: str = 'live'
+    traffic_archive: Optional[str] = None
+    adaptive_timeouts: bool = True
+    hedge_requests: bool = False
 
 @app.post("/scan")
 async def scan(request: ScanRequest):
+    if request.response_format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported response_format: {request.response_format}")
+    if request.result_policy not in RESULT_POLICIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported result_policy: {request.result_policy}")
+    if request.probe_concurrency is not None and request.probe_concurrency < 1:
+        raise HTTPException(status_code=400, detail="probe_concurrency must be at least 1")
+    if request.membership not in MEMBERSHIP_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported membership: {request.membership}")
+    if not 0 < request.membership_error_rate < 1:
+        raise HTTPException(status_code=400, detail="membership_error_rate must be between 0 and 1")
+    if request.traffic_mode not in TRAFFIC_MODES:
+        raise HTTPException(status_code=400, detail=f"Unsupported traffic_mode: {request.traffic_mode}")
+    archive_path = None
+    if request.traffic_mode != 'live':
+        if not request.traffic_archive or not TRAFFIC_ARCHIVE_NAME_PATTERN.match(request.traffic_archive) or request.traffic_archive.startswith('.'):
+            raise HTTPException(status_code=400, detail="traffic_archive must be a plain archive name for record/replay modes")
+        archive_path = os.path.join(TRAFFIC_ARCHIVE_DIR, request.traffic_archive)
+        if request.traffic_mode == 'replay' and not os.path.exists(archive_path):
+            raise HTTPException(status_code=404, detail=f"Unknown traffic archive: {request.traffic_archive}")
+    if request.response_format == 'msgpack' and not MSGPACK_AVAILABLE:
+        raise HTTPException(status_code=400, detail="response_format 'msgpack' requires the msgpack package")
+
     all_results_by_target = {} 
 
     final_dictionary = []
+    user_paths = set()
     if request.use_default_dictionary:
         final_dictionary.extend(DEFAULT_DICTIONARY)
     
@@ -60,13 +163,20 @@ async def scan(request: ScanRequest):
             if op.type == "add":
                 for path in op.paths:
                     current_dict_set.add(path)
+                    user_paths.add(path)
             elif op.type == "remove":
                 for path in op.paths:
                     if path in current_dict_set:
                         current_dict_set.remove(path)
+                    user_paths.discard(path)
         final_dictionary = list(current_dict_set)
     
+    traffic_archive = None
     try:
+        if archive_path is not None:
+            os.makedirs(TRAFFIC_ARCHIVE_DIR, exist_ok=True)
+            traffic_archive = TrafficArchive(archive_path, request.traffic_mode)
+
         for target_url in request.target_urls:
             scanner = MultiWebScanner(
                 target_url=target_url,
@@ -74,15 +184,87 @@ async def scan(request: ScanRequest):
                 mode=request.mode,
                 exclusions=request.exclusions,
                 respect_robots_txt=request.respect_robots_txt,
-                session_cookies_string=request.session_cookies_string
+                session_cookies_string=request.session_cookies_string,
+                result_policy=request.result_policy,
+                context=SCANNER_CONTEXT if traffic_archive is None else None,
+                use_sitemaps=request.use_sitemaps,
+                max_sitemap_urls=request.max_sitemap_urls,
+                tech_aware_dictionary=request.tech_aware_dictionary,
+                mutation_budget=request.mutation_budget,
+                http2=request.http2,
+                probe_concurrency=request.probe_concurrency,
+                membership=request.membership,
+                membership_error_rate=request.membership_error_rate,
+                traffic_archive=traffic_archive,
+                adaptive_timeouts=request.adaptive_timeouts,
+                hedge_requests=request.hedge_requests,
+                user_paths=user_paths
             )
             
-            result = scanner.run(max_depth=request.max_depth)
+            if request.profile:
+                with SamplingProfiler() as profiler:
+                    result = scanner.run(max_depth=request.max_depth)
+                result["profile"] = profiler.report()
+            else:
+                result = scanner.run(max_depth=request.max_depth)
             all_results_by_target[target_url] = result
 
-        return {"result": all_results_by_target}
+        scan_id = store_scan_results(all_results_by_target)
+        if request.response_format == 'columnar':
+            return JSONResponse(build_columnar_response(all_results_by_target, scan_id))
+        if request.response_format == 'msgpack':
+            return Response(encode_msgpack_response(all_results_by_target, scan_id), media_type="application/x-msgpack")
+        return StreamingResponse(iter_scan_response_json(all_results_by_target, scan_id), media_type="application/json")
     except Exception as e:
         error_msg = f"Scan failed: {str(e)}"
         error_traceback = traceback.format_exc()
         print(f"Error: {error_msg}\n{error_traceback}")
         raise HTTPException(status_code=500, detail=error_msg)
+    finally:
+        if traffic_archive is not None:
+            traffic_archive.close()
+
+@app.get("/scans/{scan_id}/results")
+async def query_scan_results(
+    scan_id: str,
+    target_url: Optional[str] = None,
+    status: Optional[List[str]] = Query(None),
+    source: Optional[List[str]] = Query(None),
+    directory_listing: Optional[bool] = None,
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    order: str = 'asc',
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    results_by_target = get_stored_scan_results(scan_id)
+    if results_by_target is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scan_id: {scan_id}")
+    if target_url is not None and target_url not in results_by_target:
+        raise HTTPException(status_code=404, detail=f"Unknown target_url for scan: {target_url}")
+    if sort_by is not None and sort_by not in SORTABLE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort_by: {sort_by}")
+    if order not in ('asc', 'desc'):
+        raise HTTPException(status_code=400, detail=f"Unsupported order: {order}")
+
+    targets = [target_url] if target_url is not None else list(results_by_target)
+    if len(targets) == 1:
+        table = as_result_table(results_by_target[targets[0]].get("directories"))
+    else:
+        table = as_result_table({})
+        for target in targets:
+            table.update(as_result_table(results_by_target[target].get("directories")))
+
+    total, items = table.query(
+        statuses=status,
+        sources=source,
+        directory_listing=directory_listing,
+        min_length=min_length,
+        max_length=max_length,
+        sort_by=sort_by,
+        descending=(order == 'desc'),
+        offset=offset,
+        limit=limit
+    )
+    return {"scan_id": scan_id, "total": total, "offset": offset, "limit": limit, "items": items}
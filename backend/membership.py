@@ -0,0 +1,146 @@
+import hashlib
+import math
+import mmap
+import os
+import tempfile
+import threading
+
+MEMBERSHIP_KINDS = ('exact', 'bloom')
+
+
+def _hash_pair(item):
+    """원소에서 이중 해싱(double hashing)에 쓸 두 개의 64비트 해시를 계산합니다."""
+    if isinstance(item, bytes):
+        key = item
+    elif isinstance(item, str):
+        key = item.encode('utf-8', 'surrogatepass')
+    else:
+        key = repr(item).encode('utf-8', 'surrogatepass')
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class BloomFilter:
+    """고정 크기 Bloom filter. capacity 개 원소에서 오탐률이 error_rate 가 되도록 비트 수와 해시 수를 정합니다.
+
+    spill_dir 가 주어지면 비트 배열을 해당 디렉토리의 임시 파일에 mmap 하여 익명 메모리 대신 페이지 캐시를 사용합니다.
+    """
+
+    def __init__(self, capacity, error_rate, spill_dir=None):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.count = 0
+        num_bytes = (self.num_bits + 7) // 8
+        self._spill_file = None
+        if spill_dir is not None:
+            self._spill_file = tempfile.TemporaryFile(dir=spill_dir)
+            self._spill_file.truncate(num_bytes)
+            self._bits = mmap.mmap(self._spill_file.fileno(), num_bytes)
+        else:
+            self._bits = bytearray(num_bytes)
+
+    def _positions(self, hashes):
+        first, second = hashes
+        num_bits = self.num_bits
+        return [(first + i * second) % num_bits for i in range(self.num_hashes)]
+
+    def contains_hashes(self, hashes):
+        bits = self._bits
+        for position in self._positions(hashes):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add_hashes(self, hashes):
+        bits = self._bits
+        added = False
+        for position in self._positions(hashes):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item):
+        return self.contains_hashes(_hash_pair(item))
+
+    def add(self, item):
+        """원소를 추가합니다. 새로 추가된 경우 True, 이미 있던(또는 오탐인) 경우 False."""
+        return self.add_hashes(_hash_pair(item))
+
+    @property
+    def nbytes(self):
+        return len(self._bits)
+
+    def close(self):
+        if self._spill_file is not None:
+            self._bits.close()
+            self._spill_file.close()
+            self._spill_file = None
+
+
+class ScalableBloomFilter:
+    """원소 수에 맞춰 커지는 Bloom filter (Almeida et al.).
+
+    현재 필터가 가득 차면 growth 배 크기의 새 필터를 추가하고, 각 단계의 오탐률을 ratio 배씩 줄여
+    전체 오탐률이 error_rate 이하로 유지되도록 합니다. set 과 같은 add / in / len 인터페이스를 제공합니다.
+    """
+
+    def __init__(self, error_rate=0.001, initial_capacity=4096, growth=4, ratio=0.5, spill_dir=None):
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.growth = growth
+        self.ratio = ratio
+        self.spill_dir = spill_dir
+        self._filters = []
+        self._lock = threading.Lock()
+        self._add_filter()
+
+    def _add_filter(self):
+        stage = len(self._filters)
+        capacity = self.initial_capacity * (self.growth ** stage)
+        stage_error_rate = self.error_rate * (1 - self.ratio) * (self.ratio ** stage)
+        self._filters.append(BloomFilter(capacity, stage_error_rate, self.spill_dir))
+
+    def __contains__(self, item):
+        hashes = _hash_pair(item)
+        return any(bloom.contains_hashes(hashes) for bloom in reversed(self._filters))
+
+    def add(self, item):
+        hashes = _hash_pair(item)
+        with self._lock:
+            if any(bloom.contains_hashes(hashes) for bloom in reversed(self._filters)):
+                return False
+            if self._filters[-1].count >= self._filters[-1].capacity:
+                self._add_filter()
+            return self._filters[-1].add_hashes(hashes)
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self._filters)
+
+    @property
+    def nbytes(self):
+        return sum(bloom.nbytes for bloom in self._filters)
+
+    def close(self):
+        for bloom in self._filters:
+            bloom.close()
+
+
+def make_membership(kind='exact', error_rate=0.001, initial_capacity=4096, spill_dir=None):
+    """방문/탐색 여부 집합을 생성합니다. 'exact' 는 일반 set, 'bloom' 은 ScalableBloomFilter 입니다."""
+    if kind == 'exact':
+        return set()
+    if kind == 'bloom':
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        return ScalableBloomFilter(error_rate=error_rate, initial_capacity=initial_capacity, spill_dir=spill_dir)
+    raise ValueError(f"Unknown membership kind: {kind}")
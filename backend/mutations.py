@@ -0,0 +1,99 @@
+import datetime
+import itertools
+
+FILE_BACKUP_SUFFIXES = ['.bak', '.old', '~', '.orig', '.save', '.swp', '.tmp', '.copy', '.1']
+FILE_BACKUP_EXTENSIONS = ['.bak', '.old', '.zip', '.txt']
+DIRECTORY_SUFFIXES = ['_old', '-old', '.old', '_bak', '.bak', '_backup', '-backup', '_new', '-dev', '_dev', '_test', '2']
+ARCHIVE_EXTENSIONS = ['.zip', '.tar.gz', '.tgz', '.rar', '.7z', '.sql', '.sql.gz']
+WORD_EXTENSIONS = ['.php', '.html', '.txt', '.json', '.xml', '.bak', '.zip']
+
+
+def _dated_variants(stem, separator, years):
+    for year in years:
+        yield f"{stem}{separator}{year}"
+
+
+def _case_variants(stem):
+    for variant in (stem.capitalize(), stem.upper(), stem.lower()):
+        if variant != stem:
+            yield variant
+
+
+def iter_mutations(word, years=None):
+    """기본 단어/발견된 경로에서 변형 경로를 지연 생성합니다.
+
+    가능성이 높은 순서(백업 접미사 -> 확장자 -> 대소문자 -> 번호/날짜)로 생성되며 중복은 제거됩니다.
+    디렉토리('admin/')는 디렉토리 변형과 아카이브 파일을, 파일('config.php')은 백업 파일을 만듭니다.
+    """
+    if years is None:
+        current_year = datetime.date.today().year
+        years = [current_year, current_year - 1, current_year - 2]
+
+    word = word.strip().lstrip('/')
+    if not word:
+        return
+
+    seen = {word}
+    for candidate in _iter_raw_mutations(word, years):
+        if candidate and candidate not in seen:
+            seen.add(candidate)
+            yield candidate
+
+
+def _iter_raw_mutations(word, years):
+    is_directory = word.endswith('/')
+    path = word.rstrip('/')
+    parent, _, name = path.rpartition('/')
+    prefix = f"{parent}/" if parent else ''
+
+    if is_directory:
+        yield from (f"{prefix}{name}{suffix}/" for suffix in DIRECTORY_SUFFIXES)
+        yield from (f"{prefix}{name}{extension}" for extension in ARCHIVE_EXTENSIONS)
+        yield from (f"{prefix}{variant}/" for variant in _case_variants(name))
+        numbered = (f"{name}{number}" for number in range(1, 4))
+        dated = itertools.chain(_dated_variants(name, '_', years), _dated_variants(name, '-', years))
+        yield from (f"{prefix}{variant}/" for variant in itertools.chain(numbered, dated))
+        return
+
+    stem, dot, extension = name.rpartition('.')
+    if dot and stem:
+        yield from (f"{prefix}{name}{suffix}" for suffix in FILE_BACKUP_SUFFIXES)
+        yield from (f"{prefix}{stem}{backup}" for backup in FILE_BACKUP_EXTENSIONS)
+        yield f"{prefix}.{name}.swp"
+        yield f"{prefix}{name}.{years[0]}"
+        yield from (f"{prefix}{variant}.{extension}" for variant in _case_variants(stem))
+        yield from (f"{prefix}{stem}_{year}.{extension}" for year in years)
+        return
+
+    yield from (f"{prefix}{name}{extension}" for extension in WORD_EXTENSIONS)
+    yield from (f"{prefix}{name}{suffix}/" for suffix in DIRECTORY_SUFFIXES[:4])
+    yield from (f"{prefix}{variant}" for variant in _case_variants(name))
+    yield from (f"{prefix}{name}{number}" for number in range(1, 4))
+    yield from (f"{prefix}{variant}" for variant in _dated_variants(name, '_', years))
+
+
+def iter_budgeted_mutations(words, budget, already_seen=None, years=None):
+    """여러 단어의 변형을 번갈아(round-robin) 생성하여, 한 단어가 예산을 모두 쓰지 않도록 합니다.
+
+    already_seen 에 있는 경로는 건너뛰며, 최대 budget 개까지만 생성합니다.
+    """
+    if budget <= 0:
+        return
+    already_seen = already_seen if already_seen is not None else set()
+    generators = [iter_mutations(word, years) for word in words]
+    produced = 0
+    while generators and produced < budget:
+        remaining = []
+        for generator in generators:
+            candidate = next(generator, None)
+            if candidate is None:
+                continue
+            remaining.append(generator)
+            if candidate in already_seen:
+                continue
+            already_seen.add(candidate)
+            yield candidate
+            produced += 1
+            if produced >= budget:
+                return
+        generators = remaining
@@ -0,0 +1,138 @@
+import concurrent.futures.thread
+import os
+import queue
+import selectors
+import sys
+import threading
+import time
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+DEFAULT_TOP_N = 20
+
+# 스택 최상단이 이 함수들이면 스레드가 일감이나 다른 스레드의 결과를 기다리며 멈춰 있는 상태입니다.
+# (유휴 풀 워커, hedge/as_completed 대기, 이벤트 루프의 select 등) 이런 샘플은 핫 코드가 아니므로 집계하지 않습니다.
+IDLE_FRAMES = {
+    (threading.__file__, 'wait'),
+    (threading.__file__, 'join'),
+    (threading.__file__, '_wait_for_tstate_lock'),
+    (queue.__file__, 'get'),
+    (selectors.__file__, 'select'),
+    (concurrent.futures.thread.__file__, '_worker'),
+}
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame):
+    code = frame.f_code
+    return (code.co_filename, code.co_name) in IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """모든 스레드의 스택을 주기적으로 샘플링하는 저부하 프로파일러.
+
+    ThreadPoolExecutor 작업 스레드까지 포함되므로 dictionary_scan 의 네트워크 대기와
+    BeautifulSoup/정규식 처리 시간을 함께 볼 수 있습니다. 일감을 기다리며 멈춰 있는 스레드
+    (IDLE_FRAMES)는 idle_samples 로만 세고 스택에는 넣지 않습니다. 결과는 collapsed stack 형식
+    ("root;caller;callee count")으로 내보내며, speedscope 와 flamegraph.pl 에서 바로 열 수 있습니다.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stack_counts = {}
+        self.sample_count = 0
+        self.idle_samples = 0
+        self.started_at = None
+        self.duration = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='scan-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        # 샘플마다 threading.enumerate() 와 라벨 포맷을 반복하지 않도록 스레드 이름과 프레임 라벨을 캐시합니다.
+        # 스레드가 생기거나 끝나 ident 목록이 바뀐 경우에만 이름을 다시 읽습니다.
+        thread_roots = {}
+        labels = {}
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            if frames.keys() != thread_roots.keys():
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                thread_roots = {ident: thread_names.get(ident, f"thread-{ident}").split('_')[0] for ident in frames}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                if _is_idle(frame):
+                    self.idle_samples += 1
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(thread_roots[ident])
+                key = ';'.join(reversed(stack))
+                self.stack_counts[key] = self.stack_counts.get(key, 0) + 1
+            self.sample_count += 1
+
+    def collapsed_stacks(self):
+        """collapsed stack 텍스트(한 줄에 "frame;frame;... count")를 반환합니다."""
+        return '\n'.join(f"{stack} {count}" for stack, count in sorted(self.stack_counts.items()))
+
+    def hot_functions(self, top_n=DEFAULT_TOP_N):
+        """샘플 수 기준 상위 함수 목록. self 는 스택 최상단에 있던 샘플, total 은 스택 어딘가에 있던 샘플입니다."""
+        self_counts, total_counts = {}, {}
+        for stack, count in self.stack_counts.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+            for frame in set(frames):
+                total_counts[frame] = total_counts.get(frame, 0) + count
+
+        total_samples = sum(self.stack_counts.values()) or 1
+        ranked = sorted(total_counts, key=lambda frame: (self_counts.get(frame, 0), total_counts[frame]), reverse=True)
+        return [
+            {
+                'function': frame,
+                'self_samples': self_counts.get(frame, 0),
+                'total_samples': total_counts[frame],
+                'self_percent': round(100.0 * self_counts.get(frame, 0) / total_samples, 2),
+                'total_percent': round(100.0 * total_counts[frame] / total_samples, 2),
+            }
+            for frame in ranked[:top_n]
+        ]
+
+    def report(self, top_n=DEFAULT_TOP_N):
+        return {
+            'format': 'collapsed',
+            'sample_interval_ms': self.interval * 1000,
+            'samples': self.sample_count,
+            'idle_samples': self.idle_samples,
+            'duration_seconds': round(self.duration, 3),
+            'collapsed_stacks': self.collapsed_stacks(),
+            'hot_functions': self.hot_functions(top_n),
+        }
@@ -0,0 +1,17 @@
+class CookieName:
+    """requests 쿠키 객체 대신 사용하는 최소 객체. 스캐너는 쿠키 이름(.name)만 사용합니다."""
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class RequestsResponseMixin:
+    """requests.Response 와 같은 ok / 참거짓 동작을 제공합니다. 4xx/5xx 응답은 거짓으로 평가됩니다."""
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def __bool__(self):
+        return self.ok
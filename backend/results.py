@@ -0,0 +1,277 @@
+import json
+import sys
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_AVAILABLE = msgpack is not None
+
+RESULT_FIELDS = ('status_code', 'content_length', 'directory_listing', 'note', 'source')
+
+RESPONSE_FORMATS = ('json', 'columnar', 'msgpack')
+
+RESULT_POLICIES = ('all', 'interesting', 'aggregate')
+
+MISS_STATUSES = frozenset([404, 'NO_RESPONSE_OR_ERROR', 'TIMEOUT', 'EXCLUDED'])
+
+SORTABLE_FIELDS = ('url',) + RESULT_FIELDS
+
+_JSON_CHUNK_RECORDS = 500
+
+
+def _intern_value(value):
+    """문자열 값(상태/소스/노트)은 인터닝하여 동일 문자열을 하나의 객체로 공유합니다."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class ScanRecord:
+    """단일 스캔 결과 레코드. dict 대신 __slots__ 를 사용해 메모리를 줄입니다."""
+    __slots__ = RESULT_FIELDS
+
+    def __init__(self, status_code, content_length, directory_listing, note, source):
+        self.status_code = _intern_value(status_code)
+        self.content_length = content_length
+        self.directory_listing = directory_listing
+        self.note = _intern_value(note)
+        self.source = _intern_value(source)
+
+    @classmethod
+    def from_dict(cls, info):
+        return cls(
+            info.get('status_code'),
+            info.get('content_length', 0),
+            info.get('directory_listing', False),
+            info.get('note', ''),
+            info.get('source', 'unknown')
+        )
+
+    def as_dict(self):
+        return {
+            'status_code': self.status_code,
+            'content_length': self.content_length,
+            'directory_listing': self.directory_listing,
+            'note': self.note,
+            'source': self.source
+        }
+
+
+class ResultTable:
+    """URL -> ScanRecord 결과 테이블. 기존 found_directories dict 와 같은 방식으로 사용할 수 있습니다.
+
+    policy 가 'interesting' 이면 404/무응답/제외 결과를 저장하지 않고,
+    'aggregate' 이면 저장하지 않는 대신 (상태 코드, 소스) 별 개수만 집계합니다.
+    """
+
+    def __init__(self, policy='all'):
+        if policy not in RESULT_POLICIES:
+            raise ValueError(f"Unknown result policy: {policy}")
+        self.policy = policy
+        self._records = {}
+        self.miss_counts = {}
+
+    def _accept(self, record):
+        if self.policy == 'all' or record.status_code not in MISS_STATUSES:
+            return True
+        if self.policy == 'aggregate':
+            key = (record.status_code, record.source)
+            self.miss_counts[key] = self.miss_counts.get(key, 0) + 1
+        return False
+
+    def add(self, url, status_code, content_length, directory_listing, note, source):
+        self[url] = ScanRecord(status_code, content_length, directory_listing, note, source)
+
+    def __setitem__(self, url, info):
+        if not isinstance(info, ScanRecord):
+            info = ScanRecord.from_dict(info)
+        if self._accept(info):
+            self._records[url] = info
+
+    def __getitem__(self, url):
+        return self._records[url].as_dict()
+
+    def get(self, url, default=None):
+        record = self._records.get(url)
+        return record.as_dict() if record is not None else default
+
+    def __contains__(self, url):
+        return url in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def keys(self):
+        return self._records.keys()
+
+    def items(self):
+        for url, record in self._records.items():
+            yield url, record.as_dict()
+
+    def records(self):
+        return self._records.items()
+
+    def update(self, other):
+        items = other.records() if isinstance(other, ResultTable) else other.items()
+        for url, info in items:
+            self[url] = info
+
+    def to_dict(self):
+        return {url: record.as_dict() for url, record in self._records.items()}
+
+    def miss_summary(self):
+        """집계된 미발견 결과를 JSON 직렬화 가능한 목록으로 반환합니다."""
+        return [
+            {'status_code': status_code, 'source': source, 'count': count}
+            for (status_code, source), count in self.miss_counts.items()
+        ]
+
+    def query(self, statuses=None, sources=None, directory_listing=None, min_length=None, max_length=None,
+              sort_by=None, descending=False, offset=0, limit=100):
+        """필터/정렬/페이지네이션을 적용하여 (전체 개수, 결과 목록)을 반환합니다."""
+        if sort_by is not None and sort_by not in SORTABLE_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort_by}")
+        status_filter = {str(status) for status in statuses} if statuses else None
+        source_filter = set(sources) if sources else None
+
+        matched = []
+        for url, record in self._records.items():
+            if status_filter is not None and str(record.status_code) not in status_filter:
+                continue
+            if source_filter is not None and record.source not in source_filter:
+                continue
+            if directory_listing is not None and record.directory_listing != directory_listing:
+                continue
+            if min_length is not None and record.content_length < min_length:
+                continue
+            if max_length is not None and record.content_length > max_length:
+                continue
+            matched.append((url, record))
+
+        if sort_by == 'url':
+            matched.sort(key=lambda item: item[0], reverse=descending)
+        elif sort_by is not None:
+            def sort_key(item):
+                value = getattr(item[1], sort_by)
+                # 상태 코드는 int 와 str('EXCLUDED' 등)이 섞여 있으므로 타입별로 묶어서 정렬합니다.
+                return (isinstance(value, str), value)
+            matched.sort(key=sort_key, reverse=descending)
+
+        page = matched[offset:offset + limit] if limit is not None else matched[offset:]
+        return len(matched), [dict(url=url, **record.as_dict()) for url, record in page]
+
+    def to_columnar(self):
+        """열 기반 표현을 반환합니다. note/source 는 값 목록과 인덱스 배열로 사전 인코딩됩니다."""
+        columns = {
+            'url': [],
+            'status_code': [],
+            'content_length': [],
+            'directory_listing': [],
+            'note': [],
+            'source': []
+        }
+        notes, sources = {}, {}
+        for url, record in self._records.items():
+            columns['url'].append(url)
+            columns['status_code'].append(record.status_code)
+            columns['content_length'].append(record.content_length)
+            columns['directory_listing'].append(record.directory_listing)
+            columns['note'].append(notes.setdefault(record.note, len(notes)))
+            columns['source'].append(sources.setdefault(record.source, len(sources)))
+        columns['notes'] = list(notes)
+        columns['sources'] = list(sources)
+        return columns
+
+
+def as_result_table(directories):
+    if isinstance(directories, ResultTable):
+        return directories
+    table = ResultTable()
+    table.update(directories or {})
+    return table
+
+
+def _records_of(directories):
+    if isinstance(directories, ResultTable):
+        return directories.records()
+    return ((url, ScanRecord.from_dict(info)) for url, info in (directories or {}).items())
+
+
+def _iter_directories_json(directories):
+    """레코드를 기존 JSON 형태({"url": {...}})로 청크 단위로 직렬화합니다."""
+    encoded_strings = {}
+
+    def encode_cached(value):
+        encoded = encoded_strings.get(value)
+        if encoded is None:
+            encoded = json.dumps(value)
+            encoded_strings[value] = encoded
+        return encoded
+
+    yield '{'
+    buffer = []
+    first = True
+    for url, record in _records_of(directories):
+        status_code = record.status_code
+        buffer.append(
+            f'{"" if first else ","}{json.dumps(url)}:{{'
+            f'"status_code":{encode_cached(status_code) if isinstance(status_code, str) else json.dumps(status_code)},'
+            f'"content_length":{json.dumps(record.content_length)},'
+            f'"directory_listing":{"true" if record.directory_listing else "false"},'
+            f'"note":{encode_cached(record.note)},'
+            f'"source":{encode_cached(record.source)}}}'
+        )
+        first = False
+        if len(buffer) >= _JSON_CHUNK_RECORDS:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+    yield '}'
+
+
+def iter_scan_response_json(results_by_target, scan_id=None):
+    """/scan 응답 전체({"result": {...}})를 결과 테이블에서 직접 JSON 청크로 생성합니다."""
+    if scan_id is not None:
+        yield f'{{"scan_id":{json.dumps(scan_id)},"result":{{'
+    else:
+        yield '{"result":{'
+    for index, (target_url, result) in enumerate(results_by_target.items()):
+        if index:
+            yield ','
+        yield f'{json.dumps(target_url)}:{{'
+        first_key = True
+        for key, value in result.items():
+            yield f'{"" if first_key else ","}{json.dumps(key)}:'
+            first_key = False
+            if key == 'directories':
+                yield from _iter_directories_json(value)
+            else:
+                yield json.dumps(value)
+        yield '}'
+    yield '}}'
+
+
+def build_columnar_response(results_by_target, scan_id=None):
+    """열 기반 응답 dict 를 생성합니다. directories 만 열 형태로 바뀌고 나머지 키는 그대로 유지됩니다."""
+    payload = {}
+    for target_url, result in results_by_target.items():
+        target_payload = dict(result)
+        target_payload['directories'] = as_result_table(result.get('directories')).to_columnar()
+        payload[target_url] = target_payload
+    response = {"format": "columnar", "result": payload}
+    if scan_id is not None:
+        response["scan_id"] = scan_id
+    return response
+
+
+def encode_msgpack_response(results_by_target, scan_id=None):
+    """열 기반 응답을 msgpack 바이트로 인코딩합니다. msgpack 이 설치되지 않은 경우 RuntimeError."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(build_columnar_response(results_by_target, scan_id), use_bin_type=True)
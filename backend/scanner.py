@@ -1,9 +1,20 @@
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import concurrent.futures
+import contextlib
+import io
+import threading
+import time
 import re
 from typing import Optional, List
+from results import ResultTable
+from content_cache import content_digest, JS_PATH_CACHE
+from sitemap import open_sitemap_stream, iter_sitemap_entries
+from fingerprint import fingerprint_response, match_signals, score_signals, detected_technologies, select_dictionary
+from mutations import iter_budgeted_mutations
+from membership import make_membership
+from api_tree import ApiPrefixTree
+from latency import HostLatencyTracker
 
 PROXIES = {
     'http': 'socks5h://torproxy:9050',
@@ -16,6 +27,10 @@ HEADERS = {
                    'Chrome/110.0.0.0 Safari/537.36')
 }
 
+HTTP1_PROBE_WORKERS = 10
+CONTENT_CLUSTER_SAMPLE_SIZE = 20
+HTTP2_PROBE_WORKERS = 64
+
 DEFAULT_API_DICTIONARY = [
     "",
     "users", "user", "items", "products", "orders", "cart", "auth", "login", "logout",
@@ -24,26 +39,101 @@ DEFAULT_API_DICTIONARY = [
     "metrics", "logs", "admin", "management", "payment", "search", "notifications"
 ]
 
+def create_session(mode='normal'):
+    """모드에 맞는 헤더/프록시가 설정된 requests 세션을 생성합니다."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    if mode == 'darkweb':
+        session.proxies = PROXIES
+        session.timeout = 30
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; rv:91.0) Gecko/20100101 Firefox/91.0',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'DNT': '1'
+        })
+    return session
+
+def create_adapter(mode='normal'):
+    """호스트별 requests 연결 풀. ScannerContext 를 통해 스캔 간에는 세션 대신 이 어댑터만 공유합니다."""
+    return requests.adapters.HTTPAdapter(pool_maxsize=HTTP1_PROBE_WORKERS * 2)
+
 class MultiWebScanner:
-    def __init__(self, target_url, dictionary, mode='normal', exclusions=None, respect_robots_txt=True, session_cookies_string: Optional[str] = None):
-        """초기화 함수: 대상 URL, 딕셔너리 목록, 모드, 제외 목록, 세션 쿠키 문자열을 입력받습니다."""
+    def __init__(self, target_url, dictionary, mode='normal', exclusions=None, respect_robots_txt=True, session_cookies_string: Optional[str] = None,
+                 result_policy='all', context=None, use_sitemaps=True, max_sitemap_urls=500,
+                 tech_aware_dictionary=True, mutation_budget=200, http2=False, probe_concurrency=None,
+                 h2c_prior_knowledge=False, membership='exact', membership_error_rate=0.001, membership_spill_dir=None,
+                 traffic_archive=None, adaptive_timeouts=True, hedge_requests=False, user_paths=None):
+        """초기화 함수: 대상 URL, 딕셔너리 목록, 모드, 제외 목록, 세션 쿠키 문자열, 결과 저장 정책을 입력받습니다.
+
+        context(ScannerContext)가 주어지면 호스트별 세션과 robots.txt 규칙을 요청 간에 재사용합니다.
+        세션 쿠키가 지정된 스캔은 쿠키가 다른 스캔에 섞이지 않도록 항상 별도 세션을 사용합니다.
+        membership='bloom' 이면 방문/탐색 집합을 Bloom filter 로 대체하여 대규모 크롤링의 메모리를 제한합니다.
+        traffic_archive(TrafficArchive)가 주어지면 모든 HTTP 교환을 기록하거나(record) 아카이브에서 재생합니다(replay).
+        user_paths 는 사용자가 직접 추가한 사전 경로로, 기술 탐지에 따른 사전 재구성에서 제외되지 않습니다.
+        adaptive_timeouts 면 호스트별 응답 시간 p99 로 타임아웃을 줄이고, hedge_requests 면 p95 를 넘긴 요청을 한 번 더 보냅니다.
+        """
+        self.traffic_archive = traffic_archive
+        self.adaptive_timeouts = adaptive_timeouts
+        self.hedge_requests = hedge_requests
+        self.latency_tracker = HostLatencyTracker()
+        self._hedge_executor = None
+        self._request_stats_lock = threading.Lock()
+        self.request_stats = {'timeouts': 0, 'hedged': 0, 'hedge_wins': 0}
+        self.membership_options = {
+            'kind': membership,
+            'error_rate': membership_error_rate,
+            'spill_dir': membership_spill_dir
+        }
+        self._memberships = []
         self.target_url = target_url.rstrip('/')
         self.dictionary = dictionary
+        self.base_dictionary = list(dictionary)
+        self.tech_aware_dictionary = tech_aware_dictionary
+        self.technology_scores = {}
+        self.technology_signals = set()
+        self.user_paths = frozenset(user_paths or ())
+        self.mutation_budget = mutation_budget
+        self.mutation_probes_used = 0
+        self.mutation_candidates_seen = self._new_membership()
+        self.detected_technologies = []
         self.api_dictionary = DEFAULT_API_DICTIONARY
         self.base_domain = urlparse(self.target_url).netloc
-        self.found_directories = {}
-        self.dictionary_scanned = set()
+        self.found_directories = ResultTable(policy=result_policy)
+        self.dictionary_scanned = self._new_membership()
         self.mode = mode
         self.exclusions = set(exclusions) if exclusions else set()
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.context = context
+        parsed_target = urlparse(self.target_url)
+        self.origin = f"{parsed_target.scheme}://{parsed_target.netloc}"
+        self.session = create_session(self.mode)
+        if context is not None:
+            # 세션(쿠키 저장소)은 스캔마다 새로 만들고, 대상 origin 의 연결 풀만 공유합니다.
+            self.session.mount(f"{self.origin}/", context.get_adapter(self.origin, self.mode, create_adapter))
         self.respect_robots_txt = respect_robots_txt
         self.robots_disallowed_paths = set()
+        self._robots_loaded = False
+        self.robots_sitemaps = []
+        self.use_sitemaps = use_sitemaps
+        self.max_sitemap_urls = max_sitemap_urls
+        self.sitemap_seed_urls = []
         
         self.server_info = {"Server": "Unknown", "X-Powered-By": "Unknown", "Framework_Hint": "Unknown"}
         self._headers_analyzed_for_target = False
-        self.processed_js_files = set()
-        self.js_discovered_api_endpoints = set()
+        self.processed_js_files = self._new_membership()
+        self.processed_js_hashes = self._new_membership()
+        self.parsed_page_keys = self._new_membership()
+        self.content_clusters = {}
+        self._content_clusters_lock = threading.Lock()
+        self.js_discovered_api_endpoints = self._new_membership()
+        self.api_prefix_tree = ApiPrefixTree()
+        self.api_bases_expanded = set()
+        self.api_probe_stats = {
+            'endpoints_discovered': 0,
+            'endpoint_templates': 0,
+            'api_bases': 0,
+            'probes_without_tree': 0,
+            'probes_with_tree': 0
+        }
 
         if session_cookies_string:
             try:
@@ -58,22 +148,86 @@ class MultiWebScanner:
                     print(f"[*] 세션 쿠키 적용됨: {cookies_dict.keys()}")
             except Exception as e:
                 print(f"[!] 제공된 세션 쿠키 문자열 파싱 중 오류 발생: {e}")
-        
-        if self.mode == 'darkweb':
-            self.session.proxies = PROXIES
-            self.session.timeout = 30
-            self.session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; rv:91.0) Gecko/20100101 Firefox/91.0',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'DNT': '1'
-            })
-            
+
+        self.http2_transport = None
+        if http2:
+            self.http2_transport = self._create_http2_transport(shared=context is not None,
+                                                                h2c_prior_knowledge=h2c_prior_knowledge)
+        self.probe_concurrency = probe_concurrency
+
         if self.respect_robots_txt:
-            self._parse_robots_txt()
+            self._load_robots_rules()
+
+    def _new_membership(self):
+        """설정된 방식(exact set 또는 Bloom filter)으로 방문/탐색 여부 집합을 생성합니다.
+
+        생성한 집합은 run() 이 끝날 때 닫히므로(spill 파일과 mmap 해제) 스캔 이후에는 사용할 수 없습니다.
+        """
+        members = make_membership(**self.membership_options)
+        self._memberships.append(members)
+        return members
+
+    def _create_http2_transport(self, shared, h2c_prior_knowledge):
+        """HTTP/2 전송 계층을 생성합니다. 사용할 수 없는 환경(darkweb 프록시, httpx/h2 미설치)에서는 None."""
+        if self.mode == 'darkweb':
+            print("[*] darkweb 모드에서는 SOCKS 프록시를 위해 HTTP/1.1(requests)을 사용합니다.")
+            return None
+        # httpx/h2 는 import 비용이 커서 HTTP/2 를 사용하는 스캔에서만 불러옵니다.
+        from transport import Http2ConnectionPool, Http2Transport, HTTP2_AVAILABLE
+
+        if not HTTP2_AVAILABLE:
+            print("[!] httpx[http2] 가 설치되지 않아 HTTP/1.1 로 스캔합니다.")
+            return None
+
+        if shared:
+            pool = self.context.get_http2_pool(self.origin, self.mode, h2c_prior_knowledge,
+                                               lambda mode: Http2ConnectionPool(h2c_prior_knowledge=h2c_prior_knowledge))
+            return Http2Transport(self.session, pool=pool)
+        return Http2Transport(self.session, h2c_prior_knowledge=h2c_prior_knowledge)
+
+    def _probe_workers(self, base_url):
+        """딕셔너리 스캔 동시 작업 수. HTTP/2 로 다중화되는 호스트는 더 많은 동시 스트림을 사용합니다."""
+        if self.http2_transport is not None and self.http2_transport.uses_http2(base_url):
+            return self.probe_concurrency or HTTP2_PROBE_WORKERS
+        return min(self.probe_concurrency or HTTP1_PROBE_WORKERS, HTTP1_PROBE_WORKERS)
+
+    def _http_get(self, url, timeout):
+        """실제 HTTP GET 요청. HTTP/2 전송 계층이 있으면 사용하고, 없으면 requests 세션을 사용합니다.
+
+        트래픽 아카이브가 재생 모드면 네트워크 대신 아카이브에서 응답하고, 기록 모드면 응답/오류를 기록합니다.
+        """
+        archive = self.traffic_archive
+        if archive is not None and archive.mode == 'replay':
+            return archive.replay(url)
+
+        started = time.perf_counter()
+        try:
+            if self.http2_transport is not None:
+                response = self.http2_transport.get(url, timeout=timeout)
+            else:
+                response = self.session.get(url, timeout=timeout)
+        except requests.RequestException as e:
+            if archive is not None:
+                archive.record(url, error=e, elapsed=time.perf_counter() - started)
+            raise
+        if archive is not None:
+            archive.record(url, response=response, elapsed=time.perf_counter() - started)
+        return response
+
+    @contextlib.contextmanager
+    def _open_sitemap(self, sitemap_url, timeout):
+        """sitemap 문서를 (상태 코드, 읽기 스트림)으로 엽니다. 아카이브 사용 시에는 _http_get 으로 받아 기록/재생합니다."""
+        if self.traffic_archive is not None:
+            response = self._http_get(sitemap_url, timeout)
+            yield response.status_code, io.BytesIO(response.content)
+            return
+        with self.session.get(sitemap_url, timeout=timeout, stream=True) as response:
+            response.raw.decode_content = True
+            yield response.status_code, response.raw
 
     def _analyze_response_headers(self, response):
         """응답 헤더를 분석하여 서버/프레임워크 정보를 수집합니다."""
-        if not self._headers_analyzed_for_target and response:
+        if not self._headers_analyzed_for_target and response is not None:
             server_header = response.headers.get('Server')
             x_powered_by_header = response.headers.get('X-Powered-By')
             cookies = response.cookies
@@ -101,18 +255,56 @@ class MultiWebScanner:
             self._headers_analyzed_for_target = True
             print(f"[*] Server/Framework Info for {self.target_url}: {self.server_info}")
 
+    def _load_robots_rules(self):
+        """robots.txt 규칙을 컨텍스트 캐시에서 가져오고, 없으면 직접 파싱한 뒤 캐시에 저장합니다."""
+        self._robots_loaded = True
+        if self.context is not None:
+            cached_rules = self.context.get_robots_rules(self.origin, self.mode)
+            if cached_rules is not None:
+                self.robots_disallowed_paths = set(cached_rules['disallow'])
+                self.robots_sitemaps = list(cached_rules['sitemaps'])
+                print(f"[+] 캐시된 robots.txt 규칙 사용: {self.origin} ({len(self.robots_disallowed_paths)}개 Disallow)")
+                return
+
+        fetched = self._parse_robots_txt()
+
+        # 네트워크 오류로 robots.txt 를 받지 못한 경우는 빈 규칙을 TTL 동안 캐시하지 않습니다.
+        if fetched and self.context is not None:
+            self.context.store_robots_rules(self.origin, self.mode, {
+                'disallow': frozenset(self.robots_disallowed_paths),
+                'sitemaps': tuple(self.robots_sitemaps)
+            })
+
+    def _update_technology_fingerprint(self, response):
+        """응답에서 기술 신호를 누적하고, 탐지된 기술이 바뀌면 기술별 사전을 다시 선택합니다."""
+        if not self.tech_aware_dictionary or response is None:
+            return
+        # 같은 신호(예: 여러 JS 번들의 webpackJsonp)는 스캔 전체에서 한 번만 점수에 반영합니다.
+        self.technology_signals.update(match_signals(response))
+        self.technology_scores = score_signals(self.technology_signals)
+
+        framework_scores = dict(self.technology_scores)
+        for technology, score in fingerprint_response(None, self.server_info.get('Framework_Hint')).items():
+            framework_scores[technology] = framework_scores.get(technology, 0) + score
+        technologies = detected_technologies(framework_scores)
+
+        if technologies != self.detected_technologies:
+            self.detected_technologies = technologies
+            self.dictionary = select_dictionary(self.base_dictionary, technologies, keep_paths=self.user_paths)
+            print(f"[*] 기술 탐지: {technologies} -> 사전 크기 {len(self.base_dictionary)} -> {len(self.dictionary)}")
+
     def _parse_robots_txt(self):
-        """대상 URL의 robots.txt 파일을 파싱하여 Disallow 경로를 추출."""
+        """대상 URL의 robots.txt 파일을 파싱하여 Disallow 경로와 Sitemap 지시어를 추출. 응답을 받았으면 True 를 반환합니다."""
         parsed_url = urlparse(self.target_url)
         robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
         
         try:
             print(f"[+] robots.txt 확인: {robots_url}")
             timeout = 30 if self.mode == 'darkweb' else 10
-            response = self.session.get(robots_url, timeout=timeout)
+            response = self._http_get(robots_url, timeout)
             if response.status_code != 200:
                 print(f"[-] robots.txt가 없거나 접근할 수 없습니다: {response.status_code}")
-                return
+                return True
                 
             lines = response.text.splitlines()
             current_user_agent = "*"
@@ -131,6 +323,11 @@ class MultiWebScanner:
                 
                 if directive == "user-agent":
                     current_user_agent = value
+                elif directive == "sitemap":
+                    # Sitemap 지시어는 User-agent 그룹과 무관하게 적용됩니다.
+                    if value and value not in self.robots_sitemaps:
+                        self.robots_sitemaps.append(value)
+                        print(f"[+] robots.txt Sitemap 추가: {value}")
                 elif directive == "disallow" and (current_user_agent == "*" or "mozilla" in current_user_agent.lower() or self.session.headers['User-Agent'] in current_user_agent):
                     if value:
                         path = value
@@ -139,8 +336,56 @@ class MultiWebScanner:
                         print(f"[+] robots.txt Disallow 경로 추가: {disallowed_url}")
             
             print(f"[+] 총 {len(self.robots_disallowed_paths)}개의 Disallow 경로 확인됨")
+            return True
         except Exception as e:
             print(f"[!] robots.txt 파싱 중 오류 발생: {e}")
+            return False
+
+    def discover_sitemap_urls(self, max_sitemap_documents=50):
+        """robots.txt 의 Sitemap 지시어(없으면 /sitemap.xml)에서 시작해 sitemap index 를 반복적으로 따라가며
+        범위 안의 페이지 URL 을 수집합니다. 문서는 스트리밍으로 파싱되며 gzip sitemap 도 지원합니다.
+
+        respect_robots_txt 가 꺼져 있어도 Sitemap 지시어를 읽기 위해 robots.txt 를 가져옵니다.
+        이때 Disallow 규칙은 is_disallowed_by_robots 에서 적용되지 않습니다.
+        """
+        if not self._robots_loaded:
+            self._load_robots_rules()
+        pending = list(self.robots_sitemaps) or [f"{self.origin}/sitemap.xml"]
+        seen_sitemaps = set()
+        page_urls = []
+        seen_pages = set()
+        timeout = 30 if self.mode == 'darkweb' else 10
+
+        while pending and len(seen_sitemaps) < max_sitemap_documents and len(page_urls) < self.max_sitemap_urls:
+            sitemap_url = pending.pop(0)
+            if sitemap_url in seen_sitemaps or urlparse(sitemap_url).netloc != self.base_domain or self.is_excluded(sitemap_url):
+                continue
+            seen_sitemaps.add(sitemap_url)
+            print(f"[+] Sitemap 확인: {sitemap_url}")
+            try:
+                with self._open_sitemap(sitemap_url, timeout) as (status_code, raw_stream):
+                    if status_code != 200:
+                        print(f"[-] Sitemap에 접근할 수 없습니다: {sitemap_url} ({status_code})")
+                        continue
+                    for kind, loc in iter_sitemap_entries(open_sitemap_stream(raw_stream)):
+                        if kind == 'sitemap':
+                            if loc not in seen_sitemaps:
+                                pending.append(loc)
+                            continue
+                        parsed_loc = urlparse(loc)
+                        if parsed_loc.scheme not in ['http', 'https'] or parsed_loc.netloc != self.base_domain:
+                            continue
+                        if loc in seen_pages or self.is_excluded(loc):
+                            continue
+                        seen_pages.add(loc)
+                        page_urls.append(loc)
+                        if len(page_urls) >= self.max_sitemap_urls:
+                            break
+            except Exception as e:
+                print(f"[!] Sitemap 파싱 중 오류 발생 ({sitemap_url}): {e}")
+
+        print(f"[+] Sitemap에서 총 {len(page_urls)}개의 크롤링 시드 URL 확인됨")
+        return page_urls
 
     def is_disallowed_by_robots(self, url):
         """URL이 robots.txt의 Disallow 규칙에 해당하는지 확인합니다."""
@@ -173,23 +418,91 @@ class MultiWebScanner:
             return True
         return False
 
-    def fetch_url(self, url, timeout=None):
-        """URL에 GET 요청을 보내고, 실패 시 None을 반환합니다."""
+    def _count_request(self, key):
+        with self._request_stats_lock:
+            self.request_stats[key] += 1
+
+    def _request_timeout(self, host):
+        """기본 타임아웃(일반 10초, darkweb 30초). adaptive_timeouts 면 호스트 응답 시간 분포로 줄입니다."""
+        timeout = 30 if self.mode == 'darkweb' else 10
+        if self.adaptive_timeouts:
+            timeout = self.latency_tracker.timeout_for(host, timeout)
+        return timeout
+
+    def _get_hedge_executor(self):
+        with self._request_stats_lock:
+            if self._hedge_executor is None:
+                # 요청 하나가 원 요청과 hedge 요청 두 스레드를 쓰고, 진 요청은 타임아웃까지 남을 수 있어 여유를 둡니다.
+                max_workers = 4 * max(self.probe_concurrency or 0, HTTP2_PROBE_WORKERS)
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                                             thread_name_prefix='scan-hedge')
+            return self._hedge_executor
+
+    def _hedged_get(self, url, host, timeout):
+        """GET 요청이 호스트의 p95 응답 시간 안에 끝나지 않으면 같은 요청을 한 번 더 보내고 먼저 온 응답을 사용합니다.
+
+        스캐너의 요청은 모두 멱등한 GET 이므로 중복 요청을 보내도 안전합니다.
+        """
+        delay = self.latency_tracker.hedge_delay(host) if self.hedge_requests else None
+        archive = self.traffic_archive
+        if delay is None or delay >= timeout or (archive is not None and archive.mode == 'replay'):
+            return self._http_get(url, timeout)
+
+        executor = self._get_hedge_executor()
+        primary = executor.submit(self._http_get, url, timeout)
+        done, _ = concurrent.futures.wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count_request('hedged')
+        hedge = executor.submit(self._http_get, url, timeout)
+        pending = {primary, hedge}
+        last_error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.RequestException as e:
+                    last_error = e
+                    continue
+                if future is hedge:
+                    self._count_request('hedge_wins')
+                return response
+        raise last_error
+
+    def _fetch(self, url, timeout=None):
+        """URL에 GET 요청을 보내고 (응답, 실패 종류)를 반환합니다. 실패 종류는 None, 'excluded', 'timeout', 'error'."""
         if self.is_excluded(url):
             print(f"[-] 제외된 URL: {url}")
-            return None
-        
+            return None, 'excluded'
+
+        host = urlparse(url).netloc
         if timeout is None:
-            timeout = 30 if self.mode == 'darkweb' else 10
-            
+            timeout = self._request_timeout(host)
+
+        started = time.perf_counter()
         try:
-            response = self.session.get(url, timeout=timeout)
-            if urlparse(url).netloc == self.base_domain:
-                self._analyze_response_headers(response)
-            return response
+            response = self._hedged_get(url, host, timeout)
+        except requests.Timeout as e:
+            # 타임아웃은 타임아웃 값으로 기록되어, 호스트가 실제로 느려지면 적응형 타임아웃도 다시 늘어납니다.
+            self.latency_tracker.record(host, timeout)
+            self._count_request('timeouts')
+            print(f"[!] {url} 요청 시간 초과 ({timeout:.1f}s): {e}")
+            return None, 'timeout'
         except requests.RequestException as e:
             print(f"[!] {url} 접근 중 오류 발생: {e}")
-            return None
+            return None, 'error'
+
+        self.latency_tracker.record(host, time.perf_counter() - started)
+        if host == self.base_domain:
+            self._analyze_response_headers(response)
+        return response, None
+
+    def fetch_url(self, url, timeout=None):
+        """URL에 GET 요청을 보내고, 실패 시 None을 반환합니다."""
+        response, _ = self._fetch(url, timeout)
+        return response
 
     def _extract_js_links(self, soup, page_url):
         """JavaScript 파일 URL을 스크립트 태그에서 추출합니다."""
@@ -198,18 +511,16 @@ class MultiWebScanner:
             return list(js_links)
         for script_tag in soup.find_all("script", src=True):
             js_src = script_tag.get("src")
-            if js_src and js_src.lower().endswith('.js'):
+            if js_src and urlparse(js_src).path.lower().endswith('.js'):
                 full_js_url = urljoin(page_url, js_src)
                 if urlparse(full_js_url).netloc == self.base_domain:
                     js_links.add(full_js_url)
         return list(js_links)
 
-    def _parse_js_for_endpoints(self, js_content, page_url_where_script_was_found):
-        """정규식을 사용하여 JavaScript 내용에서 잠재적 API 엔드포인트 경로를 파싱합니다."""
-        if not js_content:
-            return []
-        
-        found_paths = set()
+    def _extract_js_raw_paths(self, js_content):
+        """정규식으로 JavaScript 내용에서 경로 후보 문자열을 추출합니다 (URL 해석 전)."""
+        raw_paths = []
+        seen = set()
         patterns = [
             r"""fetch\s*\(\s*['"]((?:[^'"\s]|\\')+)['"]""",
             r"""axios\.(?:get|post|put|delete|request)\s*\(\s*['"]((?:[^'"\s]|\\')+)['"]""",
@@ -220,16 +531,38 @@ class MultiWebScanner:
         for pattern in patterns:
             for match in re.finditer(pattern, js_content):
                 path = match.group(1)
-                if path.startswith('http://') or path.startswith('https://') or path.startswith('//'):
-                    parsed_path = urlparse(path)
-                    if parsed_path.netloc and parsed_path.netloc == self.base_domain:
-                        found_paths.add(urljoin(self.target_url, parsed_path.path))
-                elif path.startswith('/'):
-                    found_paths.add(urljoin(self.target_url, path))
-                else:
-                    if not any(c in path for c in ['<', '>', '{', '}']):
-                        found_paths.add(urljoin(page_url_where_script_was_found, path))
-                        
+                if path not in seen:
+                    seen.add(path)
+                    raw_paths.append(path)
+        return raw_paths
+
+    def _parse_js_for_endpoints(self, js_content, page_url_where_script_was_found, content_hash=None):
+        """정규식을 사용하여 JavaScript 내용에서 잠재적 API 엔드포인트 경로를 파싱합니다.
+
+        content_hash 가 주어지면 같은 내용에 대한 정규식 추출 결과를 캐시에서 재사용합니다.
+        """
+        if not js_content:
+            return []
+
+        raw_paths = JS_PATH_CACHE.get(content_hash)
+        if raw_paths is None:
+            raw_paths = self._extract_js_raw_paths(js_content)
+            JS_PATH_CACHE.put(content_hash, raw_paths)
+        else:
+            print(f"[*] JS Parsing: 동일한 내용의 JS 분석 결과 재사용 ({content_hash})")
+
+        found_paths = set()
+        for path in raw_paths:
+            if path.startswith('http://') or path.startswith('https://') or path.startswith('//'):
+                parsed_path = urlparse(path)
+                if parsed_path.netloc and parsed_path.netloc == self.base_domain:
+                    found_paths.add(urljoin(self.target_url, parsed_path.path))
+            elif path.startswith('/'):
+                found_paths.add(urljoin(self.target_url, path))
+            else:
+                if not any(c in path for c in ['<', '>', '{', '}']):
+                    found_paths.add(urljoin(page_url_where_script_was_found, path))
+
         filtered_endpoints = set()
         for p in found_paths:
             parsed_p = urlparse(p)
@@ -242,6 +575,36 @@ class MultiWebScanner:
         print(f"[*] JS Parsing: Found potential API paths: {filtered_endpoints}")
         return list(filtered_endpoints)
 
+    def _record_content_cluster(self, url, response):
+        """200 응답 본문의 해시를 기록하여 동일한 내용을 가진 URL 들을 묶습니다."""
+        if response is None or response.status_code != 200:
+            return None
+        digest = content_digest(response.content)
+        if digest is not None:
+            # catch-all/soft-404 호스트에서는 모든 요청이 같은 본문이므로 URL 은 일부만 보관하고 개수만 셉니다.
+            with self._content_clusters_lock:
+                cluster = self.content_clusters.get(digest)
+                if cluster is None:
+                    cluster = self.content_clusters[digest] = {'count': 0, 'sample_urls': []}
+                cluster['count'] += 1
+                if len(cluster['sample_urls']) < CONTENT_CLUSTER_SAMPLE_SIZE and url not in cluster['sample_urls']:
+                    cluster['sample_urls'].append(url)
+        return digest
+
+    def identical_content_clusters(self):
+        """두 개 이상의 URL 이 같은 본문을 반환한 경우를 "identical content" 클러스터 목록으로 반환합니다.
+
+        urls 는 최대 CONTENT_CLUSTER_SAMPLE_SIZE 개의 표본이고, count 는 같은 본문을 반환한 응답 수입니다.
+        """
+        clusters = []
+        with self._content_clusters_lock:
+            snapshot = [(digest, cluster['count'], list(cluster['sample_urls'])) for digest, cluster in self.content_clusters.items()]
+        for digest, count, sample_urls in snapshot:
+            if len(sample_urls) > 1:
+                clusters.append({'content_hash': digest, 'count': count, 'urls': sorted(sample_urls)})
+        clusters.sort(key=lambda cluster: cluster['count'], reverse=True)
+        return clusters
+
     def _check_directory_listing_patterns(self, text_content):
         """HTML 내용에서 디렉토리 리스팅 관련 패턴을 확인합니다."""
         patterns = [
@@ -259,7 +622,7 @@ class MultiWebScanner:
 
     def analyze_directory_listing(self, response):
         """응답을 분석하여 디렉토리 리스팅 여부를 판단합니다."""
-        if not response:
+        if response is None:
             return False
         if response.status_code != 200: 
             return False
@@ -286,12 +649,13 @@ class MultiWebScanner:
                 'source': source 
             }
 
-        response = self.fetch_url(url) 
-        if response:
+        response, failure = self._fetch(url)
+        if response is not None:
             status_code = response.status_code
             content_length = len(response.content)
             directory_listing = False
             note = f'Scan attempted. Status: {status_code}'
+            self._record_content_cluster(url, response)
 
             if source == 'js_api':
                 if status_code == 200:
@@ -328,6 +692,14 @@ class MultiWebScanner:
                 'note': note,
                 'source': source 
             }
+        elif failure == 'timeout':
+            return url, {
+                'status_code': 'TIMEOUT',
+                'content_length': 0,
+                'directory_listing': False,
+                'note': 'Request timed out (host did not respond within the timeout).',
+                'source': source
+            }
         else:
             return url, {
                 'status_code': 'NO_RESPONSE_OR_ERROR',
@@ -337,16 +709,23 @@ class MultiWebScanner:
                 'source': source 
             }
 
-    def dictionary_scan(self, base_url, source='initial'):
-        """딕셔너리 목록으로 디렉토리 존재 여부를 멀티스레딩으로 스캔합니다."""
-        current_dictionary = self.api_dictionary if source == 'js_api' else self.dictionary
+    def dictionary_scan(self, base_url, source='initial', dictionary=None):
+        """딕셔너리 목록으로 디렉토리 존재 여부를 멀티스레딩으로 스캔합니다.
+
+        initial/crawl 스캔에서 발견된 경로(200)와 403 디렉토리는 변형 경로 스캔(mutation_scan)으로 이어집니다.
+        """
+        if dictionary is not None:
+            current_dictionary = dictionary
+        else:
+            current_dictionary = self.api_dictionary if source == 'js_api' else self.dictionary
         if not current_dictionary:
             print(f"[-] {source} 스캔을 위한 사전이 비어있습니다: {base_url}")
             return
 
         print(f"[+] {'API' if source == 'js_api' else '일반'} 딕셔너리 스캔 시작 (Source: {source}): {base_url} (사전 크기: {len(current_dictionary)})")
         results = {}
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        hit_words = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._probe_workers(base_url)) as executor:
             future_to_dir = {
                 executor.submit(self.dictionary_scan_single, base_url, dir_name, source): dir_name
                 for dir_name in current_dictionary
@@ -357,6 +736,9 @@ class MultiWebScanner:
                 try:
                     _, scan_info = future.result() 
                     results[attempted_url] = scan_info 
+                    status_code = scan_info['status_code']
+                    if status_code == 200 or (status_code == 403 and original_dir_name.endswith('/')):
+                        hit_words.append(original_dir_name)
                 except Exception as e:
                     print(f"[!] {'API ' if source == 'js_api' else ''}딕셔너리 항목 {original_dir_name} 스캔 작업 중 예외 발생 (Source: {source}): {e}")
                     results[attempted_url] = {
@@ -369,6 +751,29 @@ class MultiWebScanner:
         self.found_directories.update(results)
         if source in ['initial', 'crawl']:
             self.dictionary_scanned.add(base_url)
+            if hit_words:
+                self.mutation_scan(base_url, hit_words)
+
+    def mutation_scan(self, base_url, hit_words):
+        """발견된 경로에서 백업/확장자/대소문자/번호·날짜 변형을 생성해 스캔합니다. 대상별 mutation_budget 을 넘지 않습니다."""
+        remaining_budget = self.mutation_budget - self.mutation_probes_used
+        if remaining_budget <= 0:
+            return
+
+        base_prefix = base_url.rstrip('/')
+        mutated_paths = []
+        for candidate in iter_budgeted_mutations(sorted(hit_words), remaining_budget):
+            mutated_url = f"{base_prefix}/{candidate}"
+            if mutated_url in self.mutation_candidates_seen or mutated_url in self.found_directories:
+                continue
+            self.mutation_candidates_seen.add(mutated_url)
+            mutated_paths.append(candidate)
+
+        if not mutated_paths:
+            return
+        self.mutation_probes_used += len(mutated_paths)
+        print(f"[+] 변형 경로 스캔: {base_url} (발견 {len(hit_words)}개 -> 변형 {len(mutated_paths)}개, 남은 예산 {self.mutation_budget - self.mutation_probes_used})")
+        self.dictionary_scan(base_url, source='mutation', dictionary=mutated_paths)
 
     def crawl_recursive(self, current_url, visited, depth, max_depth):
         """재귀적으로 내부 링크를 방문하며 각 페이지에서 딕셔너리 스캔을 진행합니다."""
@@ -386,7 +791,7 @@ class MultiWebScanner:
         visited.add(current_url)
         
         response = self.fetch_url(current_url)
-        if not response:
+        if response is None:
             return
 
         if current_url not in self.found_directories:
@@ -412,12 +817,30 @@ class MultiWebScanner:
                 'note': note,
                 'source': 'crawl'
             }
-        
-        self.dictionary_scan(current_url, source='crawl')
+            self._record_content_cluster(current_url, response)
 
         if urlparse(current_url).netloc == self.base_domain:
             self._analyze_response_headers(response)
 
+        # 401/403/5xx 페이지도 기록은 하지만, 깨진 링크마다 딕셔너리 전체를 다시 스캔하지 않도록
+        # 딕셔너리 스캔과 링크 파싱은 2xx 응답에서만 진행합니다.
+        if not 200 <= response.status_code < 300:
+            return
+
+        self.dictionary_scan(current_url, source='crawl')
+
+        # 같은 디렉토리에서 동일한 본문을 같은 깊이 이하에서 이미 파싱했다면 상대 링크 해석 결과와
+        # 따라갈 수 있는 링크 깊이도 같거나 적으므로 건너뜁니다. 더 깊은 곳에서 파싱한 경우는 다시 파싱합니다.
+        page_digest = content_digest(response.content)
+        if page_digest is not None:
+            page_dir = current_url.rsplit('/', 1)[0]
+            if any((page_digest, page_dir, parsed_depth) in self.parsed_page_keys for parsed_depth in range(depth + 1)):
+                print(f"[*] 동일한 내용의 페이지를 이미 분석함, 파싱 건너뜀: {current_url}")
+                return
+            self.parsed_page_keys.add((page_digest, page_dir, depth))
+
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(response.text, 'html.parser')
         
         if soup: 
@@ -426,8 +849,18 @@ class MultiWebScanner:
                 if js_url not in self.processed_js_files:
                     self.processed_js_files.add(js_url) 
                     js_response = self.fetch_url(js_url) 
-                    if js_response and js_response.text:
-                        self.js_scan_and_evaluate_api_bases(js_response.text, js_url)
+                    if js_response is not None and js_response.status_code == 200 and js_response.text:
+                        js_hash = content_digest(js_response.content)
+                        # 상대 경로는 JS URL 기준으로 해석되므로 같은 디렉토리의 동일 번들만 건너뜁니다.
+                        # 다른 위치의 동일 번들은 정규식 추출 결과만 JS_PATH_CACHE 에서 재사용합니다.
+                        js_key = (js_hash, js_url.rsplit('/', 1)[0])
+                        if js_hash is not None and js_key in self.processed_js_hashes:
+                            print(f"[*] 동일한 내용의 JS 파일을 이미 분석함, 건너뜀: {js_url}")
+                            continue
+                        if js_hash is not None:
+                            self.processed_js_hashes.add(js_key)
+                        self._update_technology_fingerprint(js_response)
+                        self.js_scan_and_evaluate_api_bases(js_response.text, js_url, content_hash=js_hash)
                     else:
                         print(f"[-] JS 파일 내용을 가져오지 못함: {js_url}")
 
@@ -466,8 +899,25 @@ class MultiWebScanner:
 
     def run(self, max_depth=2):
         """스캔 실행 함수."""
+        try:
+            return self._run_scan(max_depth)
+        finally:
+            if self.http2_transport is not None:
+                # 공유 풀을 사용하는 전송 계층은 자신의 풀을 닫지 않고, 공유 풀은 ScannerContext 가 닫습니다.
+                self.http2_transport.close()
+            if self._hedge_executor is not None:
+                # 스캔이 예외로 끝나도 hedge 스레드가 남지 않도록 항상 정리합니다.
+                # 진 hedge 요청은 기다리지 않고 타임아웃으로 끝나도록 둡니다.
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+            for members in self._memberships:
+                if hasattr(members, 'close'):
+                    members.close()
+            self._memberships = []
+
+    def _run_scan(self, max_depth):
         initial_response = self.fetch_url(self.target_url)
-        if initial_response:
+        if initial_response is not None:
             if self.target_url not in self.found_directories:
                 status_code = initial_response.status_code
                 content_length = len(initial_response.content)
@@ -491,61 +941,121 @@ class MultiWebScanner:
                     'note': note,
                     'source': 'target_base' 
                 }
+                self._record_content_cluster(self.target_url, initial_response)
 
             if not self._headers_analyzed_for_target:
                  self._analyze_response_headers(initial_response)
+            self._update_technology_fingerprint(initial_response)
 
         self.dictionary_scan(self.target_url, source='initial') 
         
-        visited = set()
+        visited = self._new_membership()
         print(f"[+] 재귀적 크롤링 시작: {self.target_url}")
         self.crawl_recursive(self.target_url, visited, depth=0, max_depth=max_depth)
+
+        if self.use_sitemaps:
+            # sitemap 에서 얻은 URL 은 링크를 따라 깊이 들어가지 않고 시드로 한 번씩만 크롤링합니다.
+            self.sitemap_seed_urls = self.discover_sitemap_urls()
+            for seed_url in self.sitemap_seed_urls:
+                if seed_url not in visited:
+                    self.crawl_recursive(seed_url, visited, depth=max_depth, max_depth=max_depth)
         
-        return {"directories": self.found_directories, "server_info": self.server_info}
+        result = {
+            "directories": self.found_directories,
+            "server_info": self.server_info,
+            "content_clusters": self.identical_content_clusters(),
+            "technologies": {"detected": self.detected_technologies, "scores": self.technology_scores},
+            "api_probe_stats": dict(
+                self.api_probe_stats,
+                probes_saved=self.api_probe_stats['probes_without_tree'] - self.api_probe_stats['probes_with_tree']
+            ),
+            "request_stats": dict(self.request_stats, latency=self.latency_tracker.summary())
+        }
+        if self.found_directories.policy == 'aggregate':
+            result["miss_summary"] = self.found_directories.miss_summary()
+        if self.traffic_archive is not None:
+            self.traffic_archive.flush()
+        return result
 
-    def js_scan_and_evaluate_api_bases(self, js_content, page_url):
-        """JavaScript 내용에서 API 경로를 파싱하고 발견된 경로를 스캔합니다."""
-        potential_api_paths = self._parse_js_for_endpoints(js_content, page_url)
+    def js_scan_and_evaluate_api_bases(self, js_content, page_url, content_hash=None):
+        """JavaScript 내용에서 API 경로를 파싱하고 발견된 경로를 스캔합니다.
 
-        if potential_api_paths:
-            for api_base_url in potential_api_paths:
-                if api_base_url in self.js_discovered_api_endpoints:
-                    continue
-                if self.is_excluded(api_base_url):
-                    print(f"[-] JS API Base {api_base_url} is excluded.")
-                    self.js_discovered_api_endpoints.add(api_base_url)
-                    continue
-                
-                self.js_discovered_api_endpoints.add(api_base_url)
-
-                print(f"[+] JS에서 API 엔드포인트 발견, 직접 확인 및 딕셔너리 스캔 시도: {api_base_url}")
-
-                response = self.fetch_url(api_base_url)
-                if response:
-                    status_code = response.status_code
-                    if status_code in [200, 403, 401, 405, 400, 404, 500]:
-                        content_length = len(response.content)
-                        directory_listing = self.analyze_directory_listing(response) if 'text/html' in response.headers.get('Content-Type','').lower() else False
-                        
-                        note = f"JS Discovered API Base. Status: {status_code}"
-                        if status_code == 200:
-                            note = f"JS Discovered API Base found (200)."
-                        elif status_code == 403:
-                            note = f"JS Discovered API Base access denied (403)."
-                        elif status_code == 401:
-                            note = f"JS Discovered API Base requires authentication (401)."
-                        elif status_code == 405:
-                            note = f"JS Discovered API Base - Method Not Allowed (405)."
-                        elif status_code == 404:
-                            note = f"JS Discovered API Base - Not Found (404)."
-
-                        self.found_directories[api_base_url] = {
-                            'status_code': status_code,
-                            'content_length': content_length,
-                            'directory_listing': directory_listing,
-                            'note': note,
-                            'source': 'js_api_base'
-                        }
-                        print(f"[+] JS API Base Path Recorded: {api_base_url} (Status: {status_code}, Source: js_api_base)")
+        발견된 엔드포인트는 prefix tree 로 합쳐져 템플릿(/users/{id})마다 한 번만 직접 확인하고,
+        API 딕셔너리 확장은 추론된 API 베이스(/api/v1/ 등)마다 한 번만 수행합니다.
+        베이스 추론은 번들의 엔드포인트를 모두 트리에 넣은 뒤에 하므로 삽입 순서와 관계없이 같은 결과가 나옵니다.
+        """
+        potential_api_paths = self._parse_js_for_endpoints(js_content, page_url, content_hash=content_hash)
+
+        new_endpoints = []
+        for api_endpoint_url in sorted(potential_api_paths):
+            if api_endpoint_url in self.js_discovered_api_endpoints:
+                continue
+            if self.is_excluded(api_endpoint_url):
+                print(f"[-] JS API Base {api_endpoint_url} is excluded.")
+                self.js_discovered_api_endpoints.add(api_endpoint_url)
+                continue
+
+            self.js_discovered_api_endpoints.add(api_endpoint_url)
+            self.api_probe_stats['endpoints_discovered'] += 1
+            self.api_probe_stats['probes_without_tree'] += 1 + len(self.api_dictionary)
+
+            if not self.api_prefix_tree.add(api_endpoint_url):
+                print(f"[*] 이미 확인한 API 템플릿과 같은 엔드포인트, 건너뜀: {api_endpoint_url}")
+                continue
+            self.api_probe_stats['endpoint_templates'] += 1
+            self.api_probe_stats['probes_with_tree'] += 1
+            new_endpoints.append(api_endpoint_url)
+
+        candidate_bases = set()
+        for api_endpoint_url in new_endpoints:
+            print(f"[+] JS에서 API 엔드포인트 발견, 직접 확인: {api_endpoint_url}")
+            self._probe_js_api_endpoint(api_endpoint_url)
+            api_base_url = self.api_prefix_tree.infer_base(api_endpoint_url)
+            if api_base_url and not self.is_excluded(api_base_url):
+                candidate_bases.add(api_base_url)
+
+        # 같은 베이스만 한 번씩 확장합니다. /api/ 의 딕셔너리는 /api/v2/ 하위 경로를 탐색하지 않으므로
+        # 하위 베이스도 따로 확장해야 합니다. 짧은 베이스부터 정렬하여 스캔 순서를 일정하게 유지합니다.
+        new_api_bases = []
+        for api_base_url in sorted(candidate_bases, key=lambda url: (len(url), url)):
+            if api_base_url in self.api_bases_expanded:
+                continue
+            self.api_bases_expanded.add(api_base_url)
+            new_api_bases.append(api_base_url)
+
+        for api_base_url in new_api_bases:
+            print(f"[+] 추론된 API 베이스 딕셔너리 스캔: {api_base_url}")
+            self.api_probe_stats['api_bases'] += 1
+            self.api_probe_stats['probes_with_tree'] += len(self.api_dictionary)
+            self.dictionary_scan(api_base_url, source='js_api')
+
+    def _probe_js_api_endpoint(self, api_endpoint_url):
+        """JS 에서 발견된 엔드포인트를 직접 요청하여 결과를 기록합니다."""
+        response = self.fetch_url(api_endpoint_url)
+        if response is not None:
+            status_code = response.status_code
+            if status_code in [200, 403, 401, 405, 400, 404, 500]:
+                content_length = len(response.content)
+                directory_listing = self.analyze_directory_listing(response) if 'text/html' in response.headers.get('Content-Type','').lower() else False
                 
-                self.dictionary_scan(api_base_url, source='js_api')
+                note = f"JS Discovered API Base. Status: {status_code}"
+                if status_code == 200:
+                    note = f"JS Discovered API Base found (200)."
+                elif status_code == 403:
+                    note = f"JS Discovered API Base access denied (403)."
+                elif status_code == 401:
+                    note = f"JS Discovered API Base requires authentication (401)."
+                elif status_code == 405:
+                    note = f"JS Discovered API Base - Method Not Allowed (405)."
+                elif status_code == 404:
+                    note = f"JS Discovered API Base - Not Found (404)."
+
+                self.found_directories[api_endpoint_url] = {
+                    'status_code': status_code,
+                    'content_length': content_length,
+                    'directory_listing': directory_listing,
+                    'note': note,
+                    'source': 'js_api_base'
+                }
+                self._record_content_cluster(api_endpoint_url, response)
+                print(f"[+] JS API Base Path Recorded: {api_endpoint_url} (Status: {status_code}, Source: js_api_base)")
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ScannerContext:
+    """여러 /scan 요청 사이에서 공유되는 스캐너 자원(호스트별 연결 풀, robots.txt 규칙)을 보관합니다.
+
+    연결 풀(requests HTTPAdapter / HTTP2 연결 풀)은 (origin, mode) 별로 재사용되어 TCP/TLS 연결이 유지됩니다.
+    쿠키를 담는 세션은 공유하지 않으므로 한 스캔에서 받은 Set-Cookie 가 다른 스캔에 전송되지 않습니다.
+    robots.txt 파싱 결과는 robots_ttl 초 동안 캐시됩니다.
+    연결 풀은 종류(HTTPAdapter / HTTP2 연결 풀)별로 최대 max_pools 개를 보관하며, 오래 쓰지 않은 것부터 닫습니다.
+    """
+
+    def __init__(self, robots_ttl=300, max_pools=32):
+        self.robots_ttl = robots_ttl
+        self.max_pools = max_pools
+        self._adapters = OrderedDict()
+        self._http2_pools = OrderedDict()
+        self._robots_rules = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cache, key, factory):
+        with self._lock:
+            resource = cache.get(key)
+            if resource is None:
+                resource = factory()
+                cache[key] = resource
+            cache.move_to_end(key)
+            while len(cache) > self.max_pools:
+                _, evicted = cache.popitem(last=False)
+                evicted.close()
+            return resource
+
+    def get_adapter(self, origin, mode, adapter_factory):
+        """(origin, mode) 에 해당하는 공유 requests 연결 풀(HTTPAdapter)을 반환하고, 없으면 adapter_factory(mode) 로 생성합니다."""
+        return self._get_or_create(self._adapters, (origin, mode), lambda: adapter_factory(mode))
+
+    def get_http2_pool(self, origin, mode, h2c_prior_knowledge, pool_factory):
+        """(origin, mode, h2c_prior_knowledge) 에 해당하는 공유 HTTP/2 연결 풀을 반환하고, 없으면 pool_factory(mode) 로 생성합니다."""
+        return self._get_or_create(self._http2_pools, (origin, mode, h2c_prior_knowledge), lambda: pool_factory(mode))
+
+    def get_robots_rules(self, origin, mode):
+        """캐시된 robots.txt 규칙을 반환합니다. 없거나 TTL 이 지났으면 None."""
+        with self._lock:
+            entry = self._robots_rules.get((origin, mode))
+            if entry is None:
+                return None
+            stored_at, rules = entry
+            if time.monotonic() - stored_at > self.robots_ttl:
+                del self._robots_rules[(origin, mode)]
+                return None
+            return rules
+
+    def store_robots_rules(self, origin, mode, rules):
+        with self._lock:
+            self._robots_rules[(origin, mode)] = (time.monotonic(), rules)
+
+    def close(self):
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters.clear()
+            for pool in self._http2_pools.values():
+                pool.close()
+            self._http2_pools.clear()
+            self._robots_rules.clear()
@@ -0,0 +1,46 @@
+import gzip
+import io
+import xml.etree.ElementTree as ET
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def open_sitemap_stream(raw_stream):
+    """응답 스트림을 그대로 읽을 수 있는 파일 객체로 감쌉니다. gzip 이면 스트리밍 해제합니다."""
+    buffered = io.BufferedReader(raw_stream) if not isinstance(raw_stream, io.BufferedReader) else raw_stream
+    if buffered.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=buffered)
+    return buffered
+
+
+SITEMAP_NAMESPACE = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+SITEMAP_CONTAINERS = {SITEMAP_NAMESPACE + 'sitemap': 'sitemap', SITEMAP_NAMESPACE + 'url': 'url'}
+SITEMAP_LOC = SITEMAP_NAMESPACE + 'loc'
+
+
+def iter_sitemap_entries(stream):
+    """sitemap/sitemap index 문서를 iterparse 로 순회하며 ('sitemap' | 'url', loc) 을 생성합니다.
+
+    sitemaps.org 네임스페이스의 <loc> 이 <url>/<sitemap> 의 직계 자식일 때만 사용하므로
+    <image:loc>, <video:content_loc> 같은 확장 요소는 크롤링 시드가 되지 않습니다.
+    처리한 요소는 즉시 clear 하므로 문서 전체를 메모리에 올리지 않습니다.
+    """
+    root = None
+    depth = 0
+    parent_kind = None
+    parent_depth = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if root is None:
+                root = elem
+            kind = SITEMAP_CONTAINERS.get(elem.tag)
+            if kind:
+                parent_kind, parent_depth = kind, depth
+            continue
+        if elem.tag == SITEMAP_LOC and parent_kind and depth == parent_depth + 1 and elem.text:
+            yield parent_kind, elem.text.strip()
+        elif elem.tag in SITEMAP_CONTAINERS:
+            parent_kind = parent_depth = None
+            root.clear()
+        depth -= 1
@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api_tree import ApiPrefixTree, template_segment
+
+HOST = "http://testphp.vulnweb.com"
+
+
+class TestApiPrefixTree(unittest.TestCase):
+
+    def test_template_segments(self):
+        self.assertEqual(template_segment("123"), "{id}")
+        self.assertEqual(template_segment("3f2504e0-4f89-11d3-9a0c-0305e82c3301"), "{uuid}")
+        self.assertEqual(template_segment("users"), "users")
+
+    def test_leaf_endpoints_collapse_to_api_base(self):
+        tree = ApiPrefixTree()
+        self.assertTrue(tree.add(f"{HOST}/api/v1/users/123/orders"))
+        self.assertFalse(tree.add(f"{HOST}/api/v1/users/456/orders"))
+        self.assertTrue(tree.add(f"{HOST}/api/v1/products"))
+
+        self.assertEqual(tree.infer_base(f"{HOST}/api/v1/users/123/orders"), f"{HOST}/api/v1/")
+        self.assertEqual(tree.infer_base(f"{HOST}/api/v1/products"), f"{HOST}/api/v1/")
+
+    def test_base_without_api_marker_uses_branching_prefix(self):
+        tree = ApiPrefixTree()
+        tree.add(f"{HOST}/account/profile/edit")
+        tree.add(f"{HOST}/account/settings")
+        self.assertEqual(tree.infer_base(f"{HOST}/account/profile/edit"), f"{HOST}/account/")
+        self.assertIsNone(tree.infer_base(f"{HOST}/login"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fingerprint import fingerprint_response, detected_technologies, select_dictionary
+
+
+def make_response(headers, body='', cookie_names=()):
+    response = MagicMock()
+    response.headers = headers
+    response.text = body
+    cookies = []
+    for name in cookie_names:
+        cookie = MagicMock()
+        cookie.name = name
+        cookies.append(cookie)
+    response.cookies = cookies
+    return response
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_combines_cookie_and_html_signals(self):
+        response = make_response({'Content-Type': 'text/html'},
+                                 '<input name="csrfmiddlewaretoken" value="x">', cookie_names=['csrftoken'])
+        self.assertEqual(detected_technologies(fingerprint_response(response)), ['django'])
+
+    def test_select_dictionary_drops_only_tagged_default_paths(self):
+        base = ["admin/", "node_modules/", "vendor/", "admin.php", "backup/", "sql/", "static/"]
+        selected = select_dictionary(base, ['django'], keep_paths={"admin.php"})
+        self.assertNotIn("node_modules/", selected)
+        self.assertNotIn("vendor/", selected)
+        self.assertIn("admin.php", selected)
+        self.assertIn("admin/login/", selected)
+        self.assertIn("backup/", selected)
+        self.assertIn("sql/", selected)
+        self.assertIn("static/", selected)
+
+        self.assertIn("vendor/", select_dictionary(base, ['php']))
+        self.assertEqual(select_dictionary(base, []), base)
+
+if __name__ == '__main__':
+    unittest.main()
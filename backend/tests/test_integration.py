@@ -2,9 +2,14 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import subprocess
+
+import requests
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scanner import MultiWebScanner
+from scanner_context import ScannerContext
+from transport import HTTP2_AVAILABLE
 
 TARGET_HOST_URL = "http://testphp.vulnweb.com"
 
@@ -29,5 +34,66 @@ class TestIntegrationSimplified(unittest.TestCase):
         self.assertEqual(scanner.target_url, TARGET_HOST_URL)
         self.assertIn(f"{TARGET_HOST_URL}/confidential/", scanner.robots_disallowed_paths)
 
+    @patch('scanner.requests.Session.get')
+    def test_shared_context_reuses_connections_and_robots_rules(self, mock_session_get):
+        mock_robots_response = MagicMock()
+        mock_robots_response.status_code = 200
+        mock_robots_response.text = "User-agent: *\nDisallow: /confidential/"
+        mock_session_get.return_value = mock_robots_response
+        context = ScannerContext()
+
+        first = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], context=context)
+        first.session.cookies.set("sessionid", "from-first-scan")
+        second = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], context=context)
+
+        self.assertEqual(mock_session_get.call_count, 1)
+        self.assertIs(first.session.get_adapter(f"{TARGET_HOST_URL}/"), second.session.get_adapter(f"{TARGET_HOST_URL}/"))
+        self.assertIsNot(first.session, second.session)
+        self.assertEqual(len(second.session.cookies), 0)
+        self.assertEqual(first.robots_disallowed_paths, second.robots_disallowed_paths)
+
+    @patch('scanner.requests.Session.get')
+    def test_robots_rules_are_not_cached_after_fetch_error(self, mock_session_get):
+        mock_session_get.side_effect = requests.ConnectionError("unreachable")
+        context = ScannerContext()
+
+        MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], context=context)
+        MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], context=context)
+
+        self.assertEqual(mock_session_get.call_count, 2)
+        self.assertIsNone(context.get_robots_rules("http://testphp.vulnweb.com", 'normal'))
+
+    @unittest.skipUnless(HTTP2_AVAILABLE, "httpx[http2] is not installed")
+    def test_shared_http2_pool_keeps_cookies_per_scan(self):
+        context = ScannerContext()
+        try:
+            first = MultiWebScanner(target_url="https://example.com", dictionary=[], respect_robots_txt=False,
+                                    context=context, http2=True)
+            second = MultiWebScanner(target_url="https://example.com", dictionary=[], respect_robots_txt=False,
+                                     context=context, http2=True)
+            self.assertIs(first.http2_transport.pool, second.http2_transport.pool)
+            first.http2_transport._alpn_client.cookies.set("sessionid", "from-first-scan")
+            self.assertEqual(len(second.http2_transport._alpn_client.cookies), 0)
+        finally:
+            context.close()
+
+    @unittest.skipUnless(HTTP2_AVAILABLE, "httpx[http2] is not installed")
+    def test_run_closes_http2_transport(self):
+        scanner = MultiWebScanner(target_url="https://example.com", dictionary=[], respect_robots_txt=False,
+                                  http2=True)
+        transport = scanner.http2_transport
+        with patch.object(scanner, '_run_scan', side_effect=RuntimeError("scan failed")), \
+             patch.object(transport, 'close', wraps=transport.close) as close_mock:
+            with self.assertRaises(RuntimeError):
+                scanner.run(max_depth=1)
+
+        close_mock.assert_called_once_with()
+
+    def test_scanner_import_does_not_load_http2_dependencies(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = "import sys, scanner; print('httpx' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], cwd=backend_dir, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
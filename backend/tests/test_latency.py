@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from latency import HostLatencyTracker, percentile
+
+
+class TestHostLatencyTracker(unittest.TestCase):
+
+    def test_default_timeout_until_enough_samples(self):
+        tracker = HostLatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record("example.com", 0.1)
+        self.assertEqual(tracker.timeout_for("example.com", 10), 10)
+        self.assertIsNone(tracker.hedge_delay("example.com"))
+
+    def test_timeout_follows_p99_within_bounds(self):
+        tracker = HostLatencyTracker(min_samples=5, factor=3.0, min_timeout=0.5)
+        for _ in range(99):
+            tracker.record("fast.example", 0.1)
+        tracker.record("fast.example", 0.4)
+        self.assertAlmostEqual(tracker.timeout_for("fast.example", 10), 0.5)
+
+        for _ in range(100):
+            tracker.record("slow.example", 5.0)
+        self.assertEqual(tracker.timeout_for("slow.example", 10), 10)
+        self.assertEqual(tracker.timeout_for("other.example", 10), 10)
+
+    def test_window_forgets_old_samples(self):
+        tracker = HostLatencyTracker(window=10, min_samples=5, min_timeout=0.01)
+        for _ in range(10):
+            tracker.record("example.com", 3.0)
+        for _ in range(10):
+            tracker.record("example.com", 0.1)
+        self.assertAlmostEqual(tracker.timeout_for("example.com", 10), 0.3)
+        self.assertEqual(tracker.summary()["example.com"]["samples"], 10)
+
+    def test_percentile_nearest_rank(self):
+        values = sorted(range(1, 101))
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertIsNone(percentile([], 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -48,5 +48,88 @@ class TestMainAppSimplified(unittest.TestCase):
         self.assertIn("result", result)
         self.assertIn("http://example.com", result["result"])
 
+    @patch('main.MultiWebScanner')
+    def test_scan_endpoint_columnar_format(self, mock_scanner_class):
+        mock_scanner_instance = MagicMock()
+        mock_scanner_instance.run.return_value = {
+            "directories": {"http://example.com/found": {"status_code": 200, "content_length": 100, "directory_listing": False, "note": "Mocked scan.", "source": "initial"}},
+            "server_info": {"Server": "MockedServer/1.0"}
+        }
+        mock_scanner_class.return_value = mock_scanner_instance
+
+        response = self.client.post("/scan", json={"target_urls": ["http://example.com"], "response_format": "columnar"})
+
+        self.assertEqual(response.status_code, 200)
+        directories = response.json()["result"]["http://example.com"]["directories"]
+        self.assertEqual(directories["url"], ["http://example.com/found"])
+        self.assertEqual(directories["status_code"], [200])
+
+    @patch('main.MultiWebScanner')
+    def test_query_stored_scan_results(self, mock_scanner_class):
+        mock_scanner_instance = MagicMock()
+        mock_scanner_instance.run.return_value = {
+            "directories": {
+                "http://example.com/found": {"status_code": 200, "content_length": 100, "directory_listing": False, "note": "Mocked scan.", "source": "initial"},
+                "http://example.com/missing": {"status_code": 404, "content_length": 0, "directory_listing": False, "note": "Mocked scan.", "source": "initial"}
+            },
+            "server_info": {"Server": "MockedServer/1.0"}
+        }
+        mock_scanner_class.return_value = mock_scanner_instance
+
+        scan_id = self.client.post("/scan", json={"target_urls": ["http://example.com"]}).json()["scan_id"]
+        response = self.client.get(f"/scans/{scan_id}/results", params={"status": ["200"], "limit": 10})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["total"], 1)
+        self.assertEqual(body["items"][0]["url"], "http://example.com/found")
+        self.assertEqual(self.client.get("/scans/unknown/results").status_code, 404)
+
+    def test_stored_scan_results_are_bounded_by_records_and_age(self):
+        def results(count):
+            return {"http://example.com": {"directories": {
+                f"http://example.com/{index}": {"status_code": 404, "content_length": 0, "directory_listing": False,
+                                                 "note": "", "source": "initial"} for index in range(count)
+            }, "profile": {"collapsed_stacks": "x" * 1000}}}
+
+        with patch.object(main, 'MAX_STORED_RECORDS', 10), patch.object(main, 'STORED_SCAN_TTL', 60), \
+             patch.dict(main.SCAN_RESULTS_STORE, clear=True):
+            first = main.store_scan_results(results(6))
+            second = main.store_scan_results(results(6))
+            self.assertIsNone(main.get_stored_scan_results(first))
+            self.assertNotIn("profile", main.get_stored_scan_results(second)["http://example.com"])
+            self.assertIsNone(main.store_scan_results(results(11)))
+
+            with patch('main.time.monotonic', return_value=main.time.monotonic() + 61):
+                self.assertIsNone(main.get_stored_scan_results(second))
+
+    @patch('main.MultiWebScanner')
+    def test_scan_endpoint_attaches_profile(self, mock_scanner_class):
+        mock_scanner_instance = MagicMock()
+        mock_scanner_instance.run.return_value = {"directories": {}, "server_info": {}}
+        mock_scanner_class.return_value = mock_scanner_instance
+
+        response = self.client.post("/scan", json={"target_urls": ["http://example.com"], "profile": True})
+
+        self.assertEqual(response.status_code, 200)
+        profile = response.json()["result"]["http://example.com"]["profile"]
+        self.assertEqual(profile["format"], "collapsed")
+        self.assertIn("hot_functions", profile)
+
+    @patch('main.MultiWebScanner')
+    def test_scan_endpoint_rejects_invalid_probe_concurrency(self, mock_scanner_class):
+        response = self.client.post("/scan", json={"target_urls": ["http://example.com"], "probe_concurrency": -1})
+
+        self.assertEqual(response.status_code, 400)
+        mock_scanner_class.assert_not_called()
+    @patch('main.MultiWebScanner')
+    def test_scan_endpoint_rejects_archive_index_names(self, mock_scanner_class):
+        for name in ("foo.idx", "foo.IDX", ".hidden", "../foo"):
+            response = self.client.post("/scan", json={"target_urls": ["http://example.com"], "traffic_mode": "record",
+                                                       "traffic_archive": name})
+            self.assertEqual(response.status_code, 400, name)
+        mock_scanner_class.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
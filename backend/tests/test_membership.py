@@ -0,0 +1,38 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from membership import make_membership, ScalableBloomFilter
+
+
+class TestMembership(unittest.TestCase):
+
+    def test_scalable_bloom_has_no_false_negatives_and_bounded_false_positives(self):
+        members = ScalableBloomFilter(error_rate=0.01, initial_capacity=100)
+        urls = [f"http://example.com/page/{i}" for i in range(5000)]
+        for url in urls:
+            members.add(url)
+
+        self.assertTrue(all(url in members for url in urls))
+        self.assertGreater(len(members._filters), 1)
+        false_positives = sum(1 for i in range(5000, 10000) if f"http://example.com/page/{i}" in members)
+        self.assertLess(false_positives / 5000, 0.02)
+
+    def test_spilled_bloom_and_tuple_keys(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            members = make_membership('bloom', spill_dir=spill_dir)
+            self.assertTrue(members.add(("digest", "http://example.com/dir")))
+            self.assertFalse(members.add(("digest", "http://example.com/dir")))
+            self.assertIn(("digest", "http://example.com/dir"), members)
+            self.assertEqual(len(members), 1)
+            members.close()
+
+        self.assertIsInstance(make_membership('exact'), set)
+        with self.assertRaises(ValueError):
+            make_membership('cuckoo')
+
+
+if __name__ == '__main__':
+    unittest.main()
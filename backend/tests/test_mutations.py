@@ -0,0 +1,46 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mutations import iter_mutations, iter_budgeted_mutations
+from scanner import MultiWebScanner
+
+TARGET_HOST_URL = "http://testphp.vulnweb.com"
+
+
+class TestMutations(unittest.TestCase):
+
+    def test_directory_and_file_variants(self):
+        directory_variants = list(iter_mutations("admin/", years=[2024]))
+        self.assertIn("admin_old/", directory_variants)
+        self.assertIn("admin.zip", directory_variants)
+        self.assertIn("Admin/", directory_variants)
+        self.assertIn("admin_2024/", directory_variants)
+
+        file_variants = list(iter_mutations("config.php", years=[2024]))
+        self.assertIn("config.php.bak", file_variants)
+        self.assertIn("config.bak", file_variants)
+        self.assertIn(".config.php.swp", file_variants)
+
+        self.assertIn("backup.zip", list(iter_mutations("backup", years=[2024])))
+
+    def test_budget_is_shared_round_robin(self):
+        produced = list(iter_budgeted_mutations(["admin/", "config.php"], budget=4, years=[2024]))
+        self.assertEqual(len(produced), 4)
+        self.assertEqual(produced[:2], ["admin_old/", "config.php.bak"])
+
+    def test_mutation_scan_stops_at_budget(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False, mutation_budget=5)
+        with patch.object(scanner, 'dictionary_scan') as dictionary_scan_mock:
+            scanner.mutation_scan(TARGET_HOST_URL, ["admin/", "backup/"])
+            scanner.mutation_scan(TARGET_HOST_URL, ["logs/"])
+
+        dictionary_scan_mock.assert_called_once()
+        self.assertEqual(len(dictionary_scan_mock.call_args.kwargs['dictionary']), 5)
+        self.assertEqual(scanner.mutation_probes_used, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import re
+import threading
+import concurrent.futures
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from profiling import SamplingProfiler
+
+
+def busy_regex_work():
+    text = "fetch('/api/v1/users') " * 2000
+    for _ in range(200):
+        re.findall(r"fetch\('([^']+)'\)", text)
+
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def test_report_contains_collapsed_stacks_and_hot_functions(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            busy_regex_work()
+
+        report = profiler.report(top_n=5)
+        self.assertGreater(report['samples'], 0)
+        self.assertIn('busy_regex_work', report['collapsed_stacks'])
+        for line in report['collapsed_stacks'].splitlines():
+            self.assertRegex(line, r'^.+ \d+$')
+        self.assertLessEqual(len(report['hot_functions']), 5)
+        self.assertTrue(any('busy_regex_work' in entry['function'] for entry in profiler.hot_functions(50)))
+
+    def test_parked_threads_are_not_sampled(self):
+        release = threading.Event()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            parked = executor.submit(release.wait)
+            with SamplingProfiler(interval=0.001) as profiler:
+                busy_regex_work()
+            release.set()
+            parked.result()
+
+        self.assertGreater(profiler.idle_samples, 0)
+        self.assertFalse(any(stack.startswith('ThreadPoolExecutor') for stack in profiler.stack_counts))
+        self.assertTrue(any('busy_regex_work' in entry['function'] for entry in profiler.hot_functions(50)))
+
+
+if __name__ == '__main__':
+    unittest.main()
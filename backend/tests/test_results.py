@@ -0,0 +1,63 @@
+import unittest
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from results import ResultTable, iter_scan_response_json, build_columnar_response
+
+
+class TestResultTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = ResultTable()
+        self.table["http://example.com/admin/"] = {
+            'status_code': 200, 'content_length': 10, 'directory_listing': True,
+            'note': 'Directory listing found (200).', 'source': 'initial'
+        }
+        self.table["http://example.com/\"quoted\""] = {
+            'status_code': 'NO_RESPONSE_OR_ERROR', 'content_length': 0, 'directory_listing': False,
+            'note': 'Failed to fetch URL (request error or excluded by fetch_url).', 'source': 'initial'
+        }
+
+    def test_json_encoder_matches_dict_shape(self):
+        results_by_target = {"http://example.com": {"directories": self.table, "server_info": {"Server": "nginx"}}}
+        encoded = json.loads(''.join(iter_scan_response_json(results_by_target)))
+        expected = {"result": {"http://example.com": {"directories": self.table.to_dict(), "server_info": {"Server": "nginx"}}}}
+        self.assertEqual(encoded, expected)
+
+    def test_columnar_response_dictionary_encodes_sources(self):
+        columnar = build_columnar_response({"http://example.com": {"directories": self.table, "server_info": {}}})
+        directories = columnar["result"]["http://example.com"]["directories"]
+        self.assertEqual(len(directories["url"]), 2)
+        self.assertEqual(directories["sources"], ["initial"])
+        self.assertEqual(directories["source"], [0, 0])
+        self.assertEqual(directories["notes"][directories["note"][0]], 'Directory listing found (200).')
+
+    def test_query_filters_sorts_and_paginates(self):
+        self.table["http://example.com/logs/"] = {
+            'status_code': 403, 'content_length': 50, 'directory_listing': False,
+            'note': 'Access denied (403).', 'source': 'crawl'
+        }
+        total, items = self.table.query(statuses=["200", "403"], sort_by='content_length', descending=True, limit=1)
+        self.assertEqual(total, 2)
+        self.assertEqual([item['url'] for item in items], ["http://example.com/logs/"])
+
+        total, items = self.table.query(sources=["initial"], directory_listing=True, min_length=5)
+        self.assertEqual(total, 1)
+        self.assertEqual(items[0]['url'], "http://example.com/admin/")
+
+    def test_aggregate_policy_counts_misses_instead_of_storing(self):
+        table = ResultTable(policy='aggregate')
+        for name in ("a", "b"):
+            table[f"http://example.com/{name}"] = {
+                'status_code': 404, 'content_length': 0, 'directory_listing': False,
+                'note': 'Scan attempted. Status: 404', 'source': 'initial'
+            }
+        table["http://example.com/admin/"] = self.table["http://example.com/admin/"]
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.miss_summary(), [{'status_code': 404, 'source': 'initial', 'count': 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,35 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import threading
+import time
+import tempfile
+
+import requests
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scanner import MultiWebScanner
 
 TARGET_HOST_URL = "http://testphp.vulnweb.com"
 
+def make_response(status_code, body, content_type='text/html'):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {'Content-Type': content_type}
+    response.content = body.encode()
+    response.text = body
+    response.cookies = []
+    return response
+
+def make_requests_response(status_code, body, content_type='text/html'):
+    """실제 requests.Response. MagicMock 과 달리 4xx/5xx 에서 bool() 이 False 입니다."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Content-Type'] = content_type
+    response._content = body.encode()
+    response.encoding = 'utf-8'
+    return response
+
 class TestMultiWebScannerSimplified(unittest.TestCase):
     
     @patch('scanner.requests.Session.get')
@@ -61,5 +84,230 @@ class TestMultiWebScannerSimplified(unittest.TestCase):
         self.assertFalse(scanner.is_excluded(f"{TARGET_HOST_URL}/secret"), 
                          f"URL '{TARGET_HOST_URL}/secret' should not be excluded by '/secret/' if trailing slash matters in pattern")
 
+    def test_identical_js_bundles_are_parsed_once(self):
+        from content_cache import JS_PATH_CACHE
+        JS_PATH_CACHE.clear()
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+        scanner.api_dictionary = []
+        page = '<script src="/app.js?v=1"></script><script src="/static/app.3f9a.js"></script>'
+        bundle = 'fetch("/api/v1/users")'
+        pages = {
+            f"{TARGET_HOST_URL}/": make_response(200, page),
+            f"{TARGET_HOST_URL}/app.js?v=1": make_response(200, bundle, 'application/javascript'),
+            f"{TARGET_HOST_URL}/static/app.3f9a.js": make_response(200, bundle, 'application/javascript'),
+        }
+        with patch.object(scanner, 'fetch_url', side_effect=lambda url, timeout=None: pages.get(url, make_response(404, 'nope'))), \
+             patch.object(scanner, '_extract_js_raw_paths', wraps=scanner._extract_js_raw_paths) as extract_mock:
+            scanner.crawl_recursive(f"{TARGET_HOST_URL}/", set(), depth=0, max_depth=0)
+
+        self.assertEqual(extract_mock.call_count, 1)
+        self.assertEqual(len(scanner.processed_js_files), 2)
+        self.assertIn(f"{TARGET_HOST_URL}/api/v1/users", scanner.js_discovered_api_endpoints)
+
+    def test_same_bundle_in_other_directory_resolves_relative_paths_again(self):
+        from content_cache import JS_PATH_CACHE
+        JS_PATH_CACHE.clear()
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+        scanner.api_dictionary = []
+        page = '<script src="/a/app.js"></script><script src="/b/app.js"></script>'
+        bundle = 'fetch("data/items")'
+        pages = {
+            f"{TARGET_HOST_URL}/": make_response(200, page),
+            f"{TARGET_HOST_URL}/a/app.js": make_response(200, bundle, 'application/javascript'),
+            f"{TARGET_HOST_URL}/b/app.js": make_response(200, bundle, 'application/javascript'),
+        }
+        with patch.object(scanner, 'fetch_url', side_effect=lambda url, timeout=None: pages.get(url, make_response(404, 'nope'))), \
+             patch.object(scanner, '_extract_js_raw_paths', wraps=scanner._extract_js_raw_paths) as extract_mock:
+            scanner.crawl_recursive(f"{TARGET_HOST_URL}/", set(), depth=0, max_depth=0)
+
+        self.assertEqual(extract_mock.call_count, 1)
+        self.assertIn(f"{TARGET_HOST_URL}/a/data/items", scanner.js_discovered_api_endpoints)
+        self.assertIn(f"{TARGET_HOST_URL}/b/data/items", scanner.js_discovered_api_endpoints)
+
+    def test_duplicate_page_found_shallower_is_parsed_again(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+        page = '<a href="next">next</a>'
+        pages = {
+            f"{TARGET_HOST_URL}/docs/deep": make_response(200, page),
+            f"{TARGET_HOST_URL}/docs/copy": make_response(200, page),
+            f"{TARGET_HOST_URL}/docs/next": make_response(200, 'end'),
+        }
+        visited = set()
+        with patch.object(scanner, 'fetch_url', side_effect=lambda url, timeout=None: pages.get(url, make_response(404, 'nope'))):
+            scanner.crawl_recursive(f"{TARGET_HOST_URL}/docs/deep", visited, depth=1, max_depth=1)
+            self.assertNotIn(f"{TARGET_HOST_URL}/docs/next", visited)
+            scanner.crawl_recursive(f"{TARGET_HOST_URL}/docs/copy", visited, depth=0, max_depth=1)
+
+        self.assertIn(f"{TARGET_HOST_URL}/docs/next", visited)
+
+    @patch('scanner.requests.Session.get')
+    def test_broken_crawl_link_is_recorded_without_dictionary_scan(self, mock_session_get):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=["admin/"], respect_robots_txt=False)
+        mock_session_get.return_value = make_requests_response(404, '<a href="/elsewhere">x</a>')
+
+        with patch.object(scanner, 'dictionary_scan') as dictionary_scan_mock:
+            scanner.crawl_recursive(f"{TARGET_HOST_URL}/broken-link", set(), depth=0, max_depth=1)
+
+        dictionary_scan_mock.assert_not_called()
+        self.assertEqual(mock_session_get.call_count, 1)
+        self.assertEqual(scanner.found_directories[f"{TARGET_HOST_URL}/broken-link"]['status_code'], 404)
+
+    def test_content_clusters_keep_counts_and_capped_samples(self):
+        from scanner import CONTENT_CLUSTER_SAMPLE_SIZE
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+        for index in range(CONTENT_CLUSTER_SAMPLE_SIZE * 5):
+            scanner._record_content_cluster(f"{TARGET_HOST_URL}/probe{index}", make_response(200, 'catch-all'))
+        scanner._record_content_cluster(f"{TARGET_HOST_URL}/unique", make_response(200, 'unique'))
+
+        clusters = scanner.identical_content_clusters()
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]['count'], CONTENT_CLUSTER_SAMPLE_SIZE * 5)
+        self.assertEqual(len(clusters[0]['urls']), CONTENT_CLUSTER_SAMPLE_SIZE)
+
+    def test_api_bases_do_not_depend_on_endpoint_order(self):
+        expanded = []
+        for bundle in ('fetch("/account/profile/edit"); fetch("/account/settings")',
+                       'fetch("/account/settings"); fetch("/account/profile/edit")'):
+            scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+            with patch.object(scanner, 'fetch_url', return_value=None), \
+                 patch.object(scanner, 'dictionary_scan') as dictionary_scan_mock:
+                scanner.js_scan_and_evaluate_api_bases(bundle, f"{TARGET_HOST_URL}/app.js")
+            expanded.append([call.args[0] for call in dictionary_scan_mock.call_args_list])
+
+        self.assertEqual(expanded[0], [f"{TARGET_HOST_URL}/account/"])
+        self.assertEqual(expanded[0], expanded[1])
+
+    def test_api_base_below_expanded_base_is_expanded_once(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+        with patch.object(scanner, 'fetch_url', return_value=None), \
+             patch.object(scanner, 'dictionary_scan') as dictionary_scan_mock:
+            scanner.js_scan_and_evaluate_api_bases('fetch("/api/users")', f"{TARGET_HOST_URL}/a.js")
+            scanner.js_scan_and_evaluate_api_bases('fetch("/api/v2/orders")', f"{TARGET_HOST_URL}/b.js")
+            scanner.js_scan_and_evaluate_api_bases('fetch("/api/v2/invoices")', f"{TARGET_HOST_URL}/c.js")
+
+        self.assertEqual([call.args[0] for call in dictionary_scan_mock.call_args_list],
+                         [f"{TARGET_HOST_URL}/api/", f"{TARGET_HOST_URL}/api/v2/"])
+
+    def test_repeated_js_signal_does_not_detect_technology(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=["admin/", "admin.php"], respect_robots_txt=False,
+                                  user_paths={"admin.php"})
+        for _ in range(3):
+            scanner._update_technology_fingerprint(make_response(200, '(window.webpackJsonp=[])', 'application/javascript'))
+
+        self.assertEqual(scanner.detected_technologies, [])
+        self.assertEqual(scanner.technology_scores, {'node': 2})
+        self.assertIn("admin.php", scanner.dictionary)
+
+    def test_js_endpoints_expand_only_inferred_api_bases(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+        bundle = ' '.join(f'fetch("/api/v1/users/{i}/orders")' for i in range(50)) + ' fetch("/api/v1/products")'
+        with patch.object(scanner, 'fetch_url', return_value=None), \
+             patch.object(scanner, 'dictionary_scan') as dictionary_scan_mock:
+            scanner.js_scan_and_evaluate_api_bases(bundle, f"{TARGET_HOST_URL}/app.js")
+
+        dictionary_scan_mock.assert_called_once_with(f"{TARGET_HOST_URL}/api/v1/", source='js_api')
+        stats = scanner.api_probe_stats
+        self.assertEqual(stats['endpoints_discovered'], 51)
+        self.assertEqual(stats['endpoint_templates'], 2)
+        self.assertEqual(stats['probes_with_tree'], 2 + len(scanner.api_dictionary))
+        self.assertEqual(stats['probes_without_tree'], 51 * (1 + len(scanner.api_dictionary)))
+
+    @patch('scanner.requests.Session.get')
+    def test_forbidden_directory_is_kept_and_mutated(self, mock_session_get):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=["admin/", "missing/"], respect_robots_txt=False,
+                                  result_policy='interesting', mutation_budget=10)
+        mock_session_get.side_effect = lambda url, timeout=None: (
+            make_requests_response(403, "forbidden") if url == f"{TARGET_HOST_URL}/admin/" else make_requests_response(404, "nope"))
+
+        with patch.object(scanner, 'mutation_scan', wraps=scanner.mutation_scan) as mutation_mock:
+            scanner.dictionary_scan(TARGET_HOST_URL, source='initial')
+
+        self.assertEqual(scanner.found_directories[f"{TARGET_HOST_URL}/admin/"]['status_code'], 403)
+        self.assertNotIn(f"{TARGET_HOST_URL}/missing/", scanner.found_directories)
+        mutation_mock.assert_any_call(TARGET_HOST_URL, ["admin/"])
+        self.assertGreater(scanner.mutation_probes_used, 0)
+
+    @patch('scanner.requests.Session.get')
+    def test_forbidden_root_is_recorded_and_fingerprinted(self, mock_session_get):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False, use_sitemaps=False)
+        root = make_requests_response(403, "forbidden")
+        root.headers['Server'] = 'nginx'
+        mock_session_get.side_effect = lambda url, timeout=None: root if url == TARGET_HOST_URL else make_requests_response(404, "nope")
+
+        result = scanner.run(max_depth=0)
+
+        self.assertEqual(result["directories"][TARGET_HOST_URL]['status_code'], 403)
+        self.assertEqual(scanner.server_info["Server"], "nginx")
+
+    @patch('scanner.requests.Session.get')
+    def test_timeouts_are_classified_separately(self, mock_session_get):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+
+        def fake_get(url, timeout=None):
+            if url.endswith('/slow'):
+                raise requests.Timeout("read timed out")
+            if url.endswith('/down'):
+                raise requests.ConnectionError("refused")
+            return make_response(404, "not found")
+
+        mock_session_get.side_effect = fake_get
+        self.assertEqual(scanner.dictionary_scan_single(TARGET_HOST_URL, "slow")[1]['status_code'], 'TIMEOUT')
+        self.assertEqual(scanner.dictionary_scan_single(TARGET_HOST_URL, "down")[1]['status_code'], 'NO_RESPONSE_OR_ERROR')
+        self.assertEqual(scanner.dictionary_scan_single(TARGET_HOST_URL, "gone")[1]['status_code'], 404)
+        self.assertEqual(scanner.request_stats['timeouts'], 1)
+
+    def test_hedge_executor_is_shut_down_when_run_fails(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False,
+                                  hedge_requests=True)
+        executor = scanner._get_hedge_executor()
+        with patch.object(scanner, 'fetch_url', side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                scanner.run(max_depth=0)
+
+        self.assertIsNone(scanner._hedge_executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(time.sleep, 0)
+
+    @patch('scanner.requests.Session.get')
+    def test_hedged_request_returns_first_answer(self, mock_session_get):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False,
+                                  hedge_requests=True)
+        host = "testphp.vulnweb.com"
+        for _ in range(50):
+            scanner.latency_tracker.record(host, 0.05)
+        self.assertEqual(scanner._request_timeout(host), 2.0)
+
+        release = threading.Event()
+        calls = []
+
+        def fake_get(url, timeout=None):
+            calls.append(url)
+            if len(calls) == 1:
+                release.wait(5)
+                return make_response(200, "slow")
+            return make_response(200, "fast")
+
+        mock_session_get.side_effect = fake_get
+        started = time.perf_counter()
+        response = scanner.fetch_url(f"{TARGET_HOST_URL}/stuck")
+        elapsed = time.perf_counter() - started
+        release.set()
+
+        self.assertEqual(response.text, "fast")
+        self.assertLess(elapsed, 2)
+        self.assertEqual(scanner.request_stats['hedged'], 1)
+        self.assertEqual(scanner.request_stats['hedge_wins'], 1)
+    def test_run_closes_spilled_membership_filters(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False,
+                                      membership='bloom', membership_spill_dir=spill_dir)
+            with patch.object(scanner, 'fetch_url', return_value=None):
+                scanner.run(max_depth=0)
+
+        filters = [scanner.dictionary_scanned, scanner.mutation_candidates_seen, scanner.parsed_page_keys]
+        self.assertTrue(all(bloom._spill_file is None for members in filters for bloom in members._filters))
+        self.assertEqual(scanner._memberships, [])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import gzip
+import io
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scanner import MultiWebScanner
+from sitemap import open_sitemap_stream, iter_sitemap_entries
+
+TARGET_HOST_URL = "http://testphp.vulnweb.com"
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>http://testphp.vulnweb.com/sitemap-pages.xml.gz</loc></sitemap>
+</sitemapindex>"""
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>http://testphp.vulnweb.com/products/</loc><lastmod>2024-01-01</lastmod></url>
+  <url><loc>http://testphp.vulnweb.com/secret/area</loc></url>
+  <url><loc>http://other.example.com/page</loc></url>
+</urlset>"""
+
+
+def make_stream_response(status_code, body):
+    response = MagicMock()
+    response.status_code = status_code
+    response.raw = io.BytesIO(body)
+    response.__enter__.return_value = response
+    return response
+
+
+class TestSitemapParsing(unittest.TestCase):
+
+    def test_iter_entries_handles_gzip_and_namespaces(self):
+        entries = list(iter_sitemap_entries(open_sitemap_stream(io.BytesIO(gzip.compress(URLSET)))))
+        self.assertEqual(entries[0], ('url', "http://testphp.vulnweb.com/products/"))
+        self.assertEqual(len(entries), 3)
+
+    def test_image_locations_are_not_pages(self):
+        image_sitemap = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url><loc>http://h/page</loc><image:image><image:loc>http://h/img/a.jpg</image:loc></image:image></url>
+</urlset>"""
+        self.assertEqual(list(iter_sitemap_entries(io.BytesIO(image_sitemap))), [('url', "http://h/page")])
+
+    def test_discover_follows_index_and_filters_scope(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], exclusions=["/secret/"], respect_robots_txt=False)
+        scanner.robots_sitemaps = [f"{TARGET_HOST_URL}/sitemap_index.xml"]
+        documents = {
+            f"{TARGET_HOST_URL}/sitemap_index.xml": SITEMAP_INDEX,
+            f"{TARGET_HOST_URL}/sitemap-pages.xml.gz": gzip.compress(URLSET),
+        }
+        with patch.object(scanner.session, 'get', side_effect=lambda url, **kwargs: make_stream_response(200, documents[url])):
+            seeds = scanner.discover_sitemap_urls()
+
+        self.assertEqual(seeds, [f"{TARGET_HOST_URL}/products/"])
+
+
+    def test_robots_sitemaps_are_read_without_respecting_robots(self):
+        scanner = MultiWebScanner(target_url=TARGET_HOST_URL, dictionary=[], respect_robots_txt=False)
+        robots = MagicMock()
+        robots.status_code = 200
+        robots.text = f"User-agent: *\nDisallow: /private/\nSitemap: {TARGET_HOST_URL}/pages.xml"
+        documents = {f"{TARGET_HOST_URL}/pages.xml": URLSET}
+
+        def fake_get(url, **kwargs):
+            if url.endswith('/robots.txt'):
+                return robots
+            return make_stream_response(200, documents[url])
+
+        with patch.object(scanner.session, 'get', side_effect=fake_get):
+            seeds = scanner.discover_sitemap_urls()
+
+        self.assertEqual(scanner.robots_sitemaps, [f"{TARGET_HOST_URL}/pages.xml"])
+        self.assertIn(f"{TARGET_HOST_URL}/products/", seeds)
+        self.assertFalse(scanner.is_disallowed_by_robots(f"{TARGET_HOST_URL}/private/x"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import tempfile
+import threading
+import sys
+import os
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scanner import MultiWebScanner
+from traffic_archive import ReplayResponse, TrafficArchive
+
+SITE = {
+    '/': (200, 'text/html', '<html><a href="/about">about</a><script src="/app.js"></script></html>'),
+    '/about': (200, 'text/html', '<html>' + 'about us ' * 200 + '</html>'),
+    '/app.js': (200, 'application/javascript', 'fetch("/api/v1/items")'),
+    '/admin/': (403, 'text/html', 'forbidden'),
+    '/backup/': (200, 'text/html', '<title>Index of /backup</title>'),
+}
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, content_type, body = SITE.get(self.path, (404, 'text/html', 'not found'))
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTrafficArchive(unittest.TestCase):
+
+    def _scan(self, target_url, archive):
+        scanner = MultiWebScanner(target_url=target_url, dictionary=["admin/", "backup/", "missing/"],
+                                  mutation_budget=0, traffic_archive=archive)
+        return scanner.run(max_depth=1)
+
+    def test_replay_reproduces_recorded_scan_without_network(self):
+        server = HTTPServer(('127.0.0.1', 0), SiteHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        target_url = f"http://127.0.0.1:{server.server_port}"
+
+        with tempfile.TemporaryDirectory() as archive_dir:
+            archive_path = os.path.join(archive_dir, 'scan.warc')
+            try:
+                with TrafficArchive(archive_path, 'record') as archive:
+                    recorded = self._scan(target_url, archive)
+            finally:
+                server.shutdown()
+                server.server_close()
+
+            with TrafficArchive(archive_path, 'replay') as archive:
+                self.assertIn(f"{target_url}/about", archive.index)
+                replayed = self._scan(target_url, archive)
+
+        self.assertEqual(replayed["directories"].to_dict(), recorded["directories"].to_dict())
+        self.assertTrue(recorded["directories"][f"{target_url}/backup/"]["directory_listing"])
+        self.assertEqual(recorded["directories"][f"{target_url}/about"]["source"], "crawl")
+        self.assertEqual(recorded["directories"][f"{target_url}/admin/"]["status_code"], 403)
+        self.assertEqual(recorded["directories"][f"{target_url}/missing/"]["status_code"], 404)
+
+    def test_index_is_rebuilt_when_missing(self):
+        with tempfile.TemporaryDirectory() as archive_dir:
+            archive_path = os.path.join(archive_dir, 'partial.warc')
+            archive = TrafficArchive(archive_path, 'record')
+            archive.record("http://example.com/", error=TimeoutError("boom"))
+            archive._data_file.close()
+
+            with TrafficArchive(archive_path, 'replay') as replay:
+                self.assertIn("http://example.com/", replay.index)
+
+    def test_rerecording_discards_previous_index(self):
+        with tempfile.TemporaryDirectory() as archive_dir:
+            archive_path = os.path.join(archive_dir, 'scan.warc')
+            with TrafficArchive(archive_path, 'record') as archive:
+                archive.record("http://example.com/old", error=TimeoutError("old"))
+                archive.record("http://example.com/older", error=TimeoutError("older"))
+
+            archive = TrafficArchive(archive_path, 'record')
+            archive.record("http://example.com/new", error=TimeoutError("new"))
+            archive._data_file.close()
+
+            with TrafficArchive(archive_path, 'replay') as replay:
+                self.assertEqual(set(replay.index), {"http://example.com/new"})
+
+        self.assertFalse(ReplayResponse("http://example.com/", 404, [], b'', None, [], 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
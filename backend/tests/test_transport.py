@@ -0,0 +1,112 @@
+import unittest
+import concurrent.futures
+import socket
+import threading
+import sys
+import os
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scanner import create_session
+from transport import Http2Transport, HTTP2_AVAILABLE
+
+if HTTP2_AVAILABLE:
+    import h2.config
+    import h2.connection
+    import h2.events
+
+
+class LocalH2cServer:
+    """테스트용 최소 h2c(prior knowledge) 서버. /found 는 200, 그 외 경로는 404 를 반환합니다."""
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.connections_accepted = 0
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections_accepted += 1
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client):
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        client.sendall(conn.data_to_send())
+        while True:
+            data = client.recv(65535)
+            if not data:
+                break
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    path = dict(event.headers)[b':path'].decode()
+                    status = '200' if path == '/found' else '404'
+                    body = f"body of {path}".encode()
+                    conn.send_headers(event.stream_id, [(':status', status), ('content-type', 'text/plain'),
+                                                        ('content-length', str(len(body)))])
+                    conn.send_data(event.stream_id, body, end_stream=True)
+            client.sendall(conn.data_to_send())
+        client.close()
+
+    def close(self):
+        self.sock.close()
+
+
+class Http11Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"http/1.1 body"
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(HTTP2_AVAILABLE, "httpx[http2] is not installed")
+class TestHttp2Transport(unittest.TestCase):
+
+    def test_concurrent_probes_are_multiplexed(self):
+        server = LocalH2cServer()
+        transport = Http2Transport(create_session(), max_connections=2, h2c_prior_knowledge=True)
+        base_url = f"http://127.0.0.1:{server.port}"
+        try:
+            paths = ["/found"] + [f"/missing{i}" for i in range(40)]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+                responses = list(executor.map(lambda path: transport.get(base_url + path, timeout=5), paths))
+        finally:
+            transport.close()
+            server.close()
+
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertEqual(responses[0].text, "body of /found")
+        self.assertTrue(all(response.http_version == 'HTTP/2' for response in responses))
+        self.assertEqual({response.status_code for response in responses[1:]}, {404})
+        self.assertLessEqual(server.connections_accepted, 2)
+
+    def test_falls_back_to_http1_for_servers_without_h2(self):
+        server = HTTPServer(('127.0.0.1', 0), Http11Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        transport = Http2Transport(create_session(), h2c_prior_knowledge=True)
+        url = f"http://127.0.0.1:{server.server_port}/"
+        try:
+            response = transport.get(url, timeout=5)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.text, "http/1.1 body")
+            self.assertFalse(transport.uses_http2(url))
+        finally:
+            transport.close()
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from response_compat import CookieName, RequestsResponseMixin
+
+TRAFFIC_MODES = ('live', 'record', 'replay')
+
+ARCHIVE_VERSION = 1
+COMPRESS_MIN_BYTES = 512
+
+
+class ReplayResponse(RequestsResponseMixin):
+    """아카이브에서 복원한 응답. 스캐너가 사용하는 requests.Response 속성만 제공합니다."""
+
+    def __init__(self, url, status_code, headers, content, encoding, cookie_names, elapsed):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding
+        self.cookies = [CookieName(name) for name in cookie_names]
+        self.elapsed_seconds = elapsed
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class TrafficArchive:
+    """fetch_url 의 요청/응답을 기록하고 재생하는 색인된 아카이브.
+
+    데이터 파일에는 레코드마다 JSON 헤더 한 줄과 본문(512바이트 이상이면 zlib 압축)이 이어서 저장되고,
+    '<path>.idx' 에 URL -> (오프셋, 헤더 길이, 본문 길이) 색인이 저장됩니다.
+    재생 모드에서는 데이터 파일을 mmap 하여 네트워크 없이 메모리 속도로 응답을 돌려줍니다.
+    요청 오류(타임아웃/연결 실패)도 기록되어 재생 시 같은 종류의 예외로 다시 발생합니다.
+    """
+
+    def __init__(self, path, mode):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown traffic archive mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.index = {}
+        self._lock = threading.Lock()
+        self._data_file = None
+        self._mmap = None
+
+        if mode == 'record':
+            # 이전 기록의 색인이 남아 있으면 기록이 중간에 끊겼을 때 새 데이터 파일과 맞지 않는 색인을 읽게 됩니다.
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+            self._data_file = open(path, 'wb')
+        else:
+            self._load_for_replay()
+
+    @property
+    def index_path(self):
+        return f"{self.path}.idx"
+
+    def _load_for_replay(self):
+        self._data_file = open(self.path, 'rb')
+        if os.path.getsize(self.path) > 0:
+            self._mmap = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                self.index = {url: tuple(entry) for url, entry in json.load(index_file)['entries'].items()}
+        else:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        """색인 파일이 없으면(기록 중 비정상 종료 등) 데이터 파일을 순차적으로 읽어 색인을 다시 만듭니다."""
+        if self._mmap is None:
+            return
+        offset = 0
+        size = len(self._mmap)
+        while offset < size:
+            newline = self._mmap.find(b'\n', offset)
+            if newline < 0:
+                break
+            header = json.loads(self._mmap[offset:newline])
+            self.index[header['url']] = (offset, newline - offset, header['body_length'])
+            offset = newline + 1 + header['body_length']
+
+    def record(self, url, response=None, error=None, elapsed=0.0):
+        """응답 또는 요청 오류 하나를 기록합니다."""
+        if self.mode != 'record':
+            return
+        body = b''
+        header = {'url': url, 'elapsed': round(elapsed, 6)}
+        if response is not None:
+            content = response.content if isinstance(response.content, (bytes, bytearray)) else b''
+            body = bytes(content)
+            if len(body) >= COMPRESS_MIN_BYTES:
+                compressed = zlib.compress(body, 6)
+                if len(compressed) < len(body):
+                    body = compressed
+                    header['compression'] = 'zlib'
+            encoding = getattr(response, 'encoding', None)
+            header.update({
+                'status_code': response.status_code,
+                'headers': list(response.headers.items()),
+                'encoding': encoding if isinstance(encoding, str) else None,
+                'cookie_names': [cookie.name for cookie in (response.cookies or [])],
+            })
+        else:
+            header['error'] = 'timeout' if isinstance(error, requests.Timeout) else 'connection'
+            header['error_message'] = str(error)
+        header['body_length'] = len(body)
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+
+        with self._lock:
+            offset = self._data_file.tell()
+            self._data_file.write(header_bytes + b'\n' + body)
+            self.index[url] = (offset, len(header_bytes), len(body))
+
+    def replay(self, url):
+        """기록된 응답을 반환합니다. 기록되지 않은 URL 이나 기록된 오류는 requests 예외로 발생합니다."""
+        entry = self.index.get(url)
+        if entry is None or self._mmap is None:
+            raise requests.ConnectionError(f"URL not found in traffic archive: {url}")
+        offset, header_length, body_length = entry
+        header = json.loads(self._mmap[offset:offset + header_length])
+        if 'error' in header:
+            error_class = requests.Timeout if header['error'] == 'timeout' else requests.ConnectionError
+            raise error_class(f"(replayed) {header.get('error_message', '')}")
+
+        body_start = offset + header_length + 1
+        body = self._mmap[body_start:body_start + body_length]
+        if header.get('compression') == 'zlib':
+            body = zlib.decompress(body)
+        return ReplayResponse(url, header['status_code'], header['headers'], body, header.get('encoding'),
+                              header.get('cookie_names', []), header.get('elapsed', 0.0))
+
+    def flush(self):
+        """기록 모드에서 데이터와 색인을 디스크에 씁니다."""
+        if self.mode != 'record':
+            return
+        with self._lock:
+            self._data_file.flush()
+            with open(self.index_path, 'w', encoding='utf-8') as index_file:
+                json.dump({'version': ARCHIVE_VERSION, 'created_at': time.time(),
+                           'entries': {url: list(entry) for url, entry in self.index.items()}}, index_file)
+
+    def close(self):
+        self.flush()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._data_file is not None:
+            self._data_file.close()
+            self._data_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,120 @@
+import threading
+from urllib.parse import urlparse
+
+import requests
+
+from response_compat import CookieName, RequestsResponseMixin
+
+try:
+    import httpx
+    import h2  # noqa: F401  httpx 의 HTTP/2 지원에 필요합니다.
+    HTTP2_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTP2_AVAILABLE = False
+
+
+class Http2Response(RequestsResponseMixin):
+    """httpx 응답을 스캐너가 사용하는 requests.Response 형태(status_code, headers, content, text, cookies)로 감쌉니다."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.http_version = response.http_version
+        self.cookies = [CookieName(name) for name in response.cookies.keys()]
+
+    @property
+    def content(self):
+        return self._response.content
+
+    @property
+    def text(self):
+        return self._response.text
+
+
+class Http2ConnectionPool:
+    """httpx 연결 풀(ALPN/h2c)과 HTTP/2 미지원 호스트 목록.
+
+    쿠키 저장소를 갖지 않으므로 ScannerContext 를 통해 여러 스캔이 공유해도 스캔 간 상태가 섞이지 않습니다.
+    """
+
+    def __init__(self, max_connections=4, h2c_prior_knowledge=False, verify=True):
+        if not HTTP2_AVAILABLE:
+            raise RuntimeError("HTTP/2 transport requires httpx and h2 (pip install 'httpx[http2]')")
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.alpn = httpx.HTTPTransport(http1=True, http2=True, limits=limits, verify=verify)
+        self.h2c = httpx.HTTPTransport(http1=False, http2=True, limits=limits, verify=verify) if h2c_prior_knowledge else None
+        self.http1_origins = set()
+        self._lock = threading.Lock()
+
+    def mark_http1(self, origin):
+        with self._lock:
+            if origin not in self.http1_origins:
+                self.http1_origins.add(origin)
+                print(f"[*] HTTP/2 미지원 호스트, HTTP/1.1 로 대체: {origin}")
+
+    def close(self):
+        self.alpn.close()
+        if self.h2c is not None:
+            self.h2c.close()
+
+
+class Http2Transport:
+    """HTTP/2 로 요청을 다중화하는 전송 계층. HTTP/2 를 지원하지 않는 호스트는 자동으로 requests(HTTP/1.1)로 대체됩니다.
+
+    https 대상은 ALPN 으로 협상하고, http 대상은 h2c_prior_knowledge 가 켜진 경우에만 h2c 로 시도합니다.
+    연결 풀(pool)은 스캔 간에 공유할 수 있고, 쿠키를 담는 httpx.Client 는 스캔(전송 계층)마다 따로 만듭니다.
+    """
+
+    def __init__(self, session, max_connections=4, h2c_prior_knowledge=False, verify=True, pool=None):
+        self.session = session
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else Http2ConnectionPool(max_connections, h2c_prior_knowledge, verify)
+        client_options = {
+            'headers': dict(session.headers),
+            'cookies': requests.utils.dict_from_cookiejar(session.cookies),
+            'follow_redirects': True,
+        }
+        self._alpn_client = httpx.Client(transport=self.pool.alpn, **client_options)
+        self._h2c_client = httpx.Client(transport=self.pool.h2c, **client_options) if self.pool.h2c is not None else None
+
+    @property
+    def h2c_prior_knowledge(self):
+        return self.pool.h2c is not None
+
+    def uses_http2(self, url):
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin in self.pool.http1_origins:
+            return False
+        return parsed.scheme == 'https' or (parsed.scheme == 'http' and self._h2c_client is not None)
+
+    def get(self, url, timeout=None):
+        """GET 요청을 보냅니다. 실패 시 requests 예외(Timeout/ConnectionError)를 발생시켜 기존 오류 처리와 맞춥니다."""
+        if not self.uses_http2(url):
+            return self.session.get(url, timeout=timeout)
+
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        client = self._alpn_client if parsed.scheme == 'https' else self._h2c_client
+        try:
+            response = client.get(url, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except (httpx.RemoteProtocolError, httpx.LocalProtocolError):
+            # h2c 를 지원하지 않는 서버 등 프로토콜 협상 실패: 이후 요청은 HTTP/1.1 로 보냅니다.
+            self.pool.mark_http1(origin)
+            return self.session.get(url, timeout=timeout)
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+        if response.http_version != 'HTTP/2':
+            self.pool.mark_http1(origin)
+        return Http2Response(response)
+
+    def close(self):
+        """자신이 만든 연결 풀만 닫습니다. 공유 풀은 ScannerContext 가 닫습니다."""
+        if self._owns_pool:
+            self.pool.close()
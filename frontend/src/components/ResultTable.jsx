@@ -45,6 +45,8 @@ const ResultTable = ({ results }) => {
               statusCodeStr === "NO_RESPONSE_OR_ERROR" ||
               statusCodeStr === "SCANNER_TASK_ERROR"
             );
+          case "TIMEOUT":
+            return statusCodeStr === "TIMEOUT";
           default:
             return true;
         }
@@ -142,6 +144,7 @@ const ResultTable = ({ results }) => {
     { value: "ALL", label: "All Attempted Paths" },
     { value: "EXCLUDED", label: "Excluded Paths" },
     { value: "NO_RESPONSE_OR_ERROR", label: "Errors/No Response" },
+    { value: "TIMEOUT", label: "Timed Out" },
   ];
 
   const getSourceDisplayName = (source) => {